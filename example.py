@@ -5,35 +5,56 @@ Logger クラスの使用例
 """
 
 import time
+import logging
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from logger import Logger
 
 
-def worker_process(logger_config_path: str, log_queue: multiprocessing.Queue, process_id: int):
+# ワーカープロセスごとに1つだけ作成するLogger（_init_worker_loggerで設定）
+_WORKER_LOGGER = None
+
+
+def _init_worker_logger(log_queue: multiprocessing.Queue, level: str):
     """
-    マルチプロセスで実行されるワーカー関数
+    ワーカープロセスの起動時に1回だけ呼ばれる初期化関数
     
     Args:
-        logger_config_path: ログ設定ファイルのパス
         log_queue: メインプロセスから渡された共通のQueue
-        process_id: プロセスID
+        level: メインプロセスで設定されたログレベル
+    """
+    global _WORKER_LOGGER
+    # 共通のQueueを使ってワーカー用のLoggerを作成（設定ファイルは読み込まない）
+    _WORKER_LOGGER = Logger.for_worker(log_queue, level=level)
+
+
+def worker_task(task_id: int) -> int:
+    """
+    ワーカープロセスで実行されるタスク
+    
+    Args:
+        task_id: タスクID
+    
+    Returns:
+        タスクID
     """
-    # 共通のQueueを使ってLoggerインスタンスを作成
-    logger_manager = Logger(logger_config_path, use_multiprocessing=True, log_queue=log_queue)
-    logger = logger_manager.get_logger(f'worker_{process_id}')
+    # プロセス起動時に作成したLoggerを再利用する（タスクごとに作成しない）
+    logger = _WORKER_LOGGER.get_logger('worker')
     
     # ログ出力
-    logger.info(f'プロセス {process_id} が開始しました')
+    logger.info('タスク %d を開始しました', task_id)
     
     for i in range(5):
-        logger.debug(f'プロセス {process_id} - 処理 {i+1}/5')
+        # %形式の引数はDEBUGが有効な場合のみ文字列に展開される
+        logger.debug('タスク %d - 処理 %d/5', task_id, i + 1)
         time.sleep(0.1)
     
-    logger.warning(f'プロセス {process_id} で警告が発生しました')
-    logger.info(f'プロセス {process_id} が完了しました')
+    logger.warning('タスク %d で警告が発生しました', task_id)
+    logger.info('タスク %d が完了しました', task_id)
     
     # ワーカープロセスではstopを呼ばない（Listenerの所有者ではないため）
+    return task_id
 
 
 def example_single_process():
@@ -56,7 +77,7 @@ def example_single_process():
     # 処理の例
     logger.info('処理を開始します')
     for i in range(3):
-        logger.info(f'ステップ {i+1}/3 を実行中')
+        logger.info('ステップ %d/3 を実行中', i + 1)
         time.sleep(0.5)
     logger.info('処理が完了しました')
     
@@ -69,29 +90,26 @@ def example_multiprocessing():
     
     config_path = 'logging_config.yaml'
     num_processes = 4
+    num_tasks = 8
     
     # メインプロセスでLoggerインスタンスを作成（QueueとListenerを起動）
     main_logger_manager = Logger(config_path, use_multiprocessing=True)
     
     # メインプロセスからもログ出力可能
     main_logger = main_logger_manager.get_logger('main_process')
-    main_logger.info(f'{num_processes}個のワーカープロセスを起動します')
-    
-    # プロセスのリスト
-    processes = []
-    
-    # 複数のプロセスを起動（共通のQueueを渡す）
-    for i in range(num_processes):
-        p = multiprocessing.Process(
-            target=worker_process,
-            args=(config_path, main_logger_manager.log_queue, i)
-        )
-        p.start()
-        processes.append(p)
-    
-    # すべてのプロセスの完了を待つ
-    for p in processes:
-        p.join()
+    main_logger.info('%d個のワーカープロセスで%d個のタスクを実行します', num_processes, num_tasks)
+    
+    # ワーカーにはメインプロセスと同じログレベルを渡す
+    worker_level = logging.getLevelName(main_logger_manager.effective_level)
+    
+    # ワーカーのLoggerはinitializerでプロセスごとに1回だけ作成する（共通のQueueを渡す）
+    with ProcessPoolExecutor(
+        max_workers=num_processes,
+        initializer=_init_worker_logger,
+        initargs=(main_logger_manager.log_queue, worker_level)
+    ) as executor:
+        # すべてのタスクの完了を待つ
+        list(executor.map(worker_task, range(num_tasks)))
     
     main_logger.info('すべてのワーカープロセスが完了しました')
     
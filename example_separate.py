@@ -56,14 +56,14 @@ def worker_function(worker_id: int, log_queue: multiprocessing.Queue):
     logger = worker_logger.get_logger(f'worker_{worker_id}')
     
     # ログ出力
-    logger.info(f'ワーカー {worker_id} が開始しました')
+    logger.info('ワーカー %d が開始しました', worker_id)
     
     # 簡単な処理
     for i in range(3):
-        logger.info(f'ワーカー {worker_id}: タスク {i+1} を処理中')
+        logger.info('ワーカー %d: タスク %d を処理中', worker_id, i + 1)
         time.sleep(0.1)
     
-    logger.info(f'ワーカー {worker_id} が完了しました')
+    logger.info('ワーカー %d が完了しました', worker_id)
 
 
 def test_multi_process_logger():
@@ -89,12 +89,12 @@ def test_multi_process_logger():
         )
         processes.append(p)
         p.start()
-        logger.info(f'ワーカープロセス {i} を起動しました')
+        logger.info('ワーカープロセス %d を起動しました', i)
     
     # すべてのプロセスが完了するのを待つ
     for i, p in enumerate(processes):
         p.join()
-        logger.info(f'ワーカープロセス {i} が終了しました')
+        logger.info('ワーカープロセス %d が終了しました', i)
     
     logger.info('すべてのワーカーが完了しました')
     
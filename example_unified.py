@@ -30,13 +30,14 @@ def test_unified_single_process():
     print("\nシングルプロセスモードのテスト完了")
 
 
-def unified_worker_function(worker_id: int, log_queue: multiprocessing.Queue):
+def unified_worker_function(worker_id: int, log_queue: multiprocessing.Queue, config: dict):
     """統合Logger用のワーカープロセス"""
-    # ワーカープロセス用のLoggerを作成
+    # ワーカープロセス用のLoggerを作成（設定ファイルは読み込まず、メインプロセスの設定を使用）
     worker_logger = UnifiedLogger(
         'logging_config.yaml',
         use_multiprocessing=True,
-        log_queue=log_queue
+        log_queue=log_queue,
+        config=config
     )
     
     print(f"ワーカー {worker_id} のモード: {worker_logger.get_mode().value}")
@@ -44,13 +45,13 @@ def unified_worker_function(worker_id: int, log_queue: multiprocessing.Queue):
     logger = worker_logger.get_logger(f'unified_worker_{worker_id}')
     
     # ログ出力
-    logger.info(f'ワーカー {worker_id} が開始しました')
+    logger.info('ワーカー %d が開始しました', worker_id)
     
     for i in range(3):
-        logger.info(f'ワーカー {worker_id}: タスク {i+1} を処理中')
+        logger.info('ワーカー %d: タスク %d を処理中', worker_id, i + 1)
         time.sleep(0.1)
     
-    logger.info(f'ワーカー {worker_id} が完了しました')
+    logger.info('ワーカー %d が完了しました', worker_id)
 
 
 def test_unified_multi_process():
@@ -74,16 +75,16 @@ def test_unified_multi_process():
     for i in range(num_workers):
         p = multiprocessing.Process(
             target=unified_worker_function,
-            args=(i, main_logger.get_queue())
+            args=(i, main_logger.get_queue(), main_logger.config)
         )
         processes.append(p)
         p.start()
-        logger.info(f'ワーカープロセス {i} を起動しました')
+        logger.info('ワーカープロセス %d を起動しました', i)
     
     # すべてのプロセスが完了するのを待つ
     for i, p in enumerate(processes):
         p.join()
-        logger.info(f'ワーカープロセス {i} が終了しました')
+        logger.info('ワーカープロセス %d が終了しました', i)
     
     logger.info('すべてのワーカーが完了しました')
     
@@ -114,7 +115,8 @@ def test_mode_switching():
     multi_worker = UnifiedLogger(
         'logging_config.yaml',
         use_multiprocessing=True,
-        log_queue=multi_main.get_queue()
+        log_queue=multi_main.get_queue(),
+        config=multi_main.config
     )
     print(f"マルチプロセスモード（ワーカー）: {multi_worker.get_mode()}")
     logger3 = multi_worker.get_logger('mode_test_worker')
@@ -147,7 +149,7 @@ def test_context_manager_both_modes():
         # ワーカープロセスを起動
         p = multiprocessing.Process(
             target=unified_worker_function,
-            args=(100, main_logger.get_queue())
+            args=(100, main_logger.get_queue(), main_logger.config)
         )
         p.start()
         p.join()
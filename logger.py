@@ -6,14 +6,616 @@
 安全にログを処理します。
 """
 
+import atexit
+import functools
+import itertools
 import logging
 import logging.handlers
 import multiprocessing
+import os
 import queue
+import re
+import threading
+import weakref
 import yaml
 import json
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Literal, Tuple, Union
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+# フォーマット文字列から参照されている属性名を取り出す
+_FORMAT_FIELD_RE = re.compile(r'%\((\w+)\)')
+
+# 呼び出し元の情報（findCallerによるスタック走査）が必要な属性
+_SOURCE_FIELDS = frozenset({'pathname', 'filename', 'module', 'lineno', 'funcName'})
+
+_ORIGINAL_SRCFILE = logging._srcfile
+
+# LogRecordの属性収集を切り替えるloggingモジュールのフラグと、対応するフォーマットの属性
+_RECORD_FLAG_FIELDS = {
+    'logThreads': frozenset({'thread', 'threadName'}),
+    'logProcesses': frozenset({'process'}),
+    'logMultiprocessing': frozenset({'processName'}),
+    'logAsyncioTasks': frozenset({'taskName'}),  # Python 3.12以降
+}
+_ORIGINAL_RECORD_FLAGS = {
+    flag: getattr(logging, flag) for flag in _RECORD_FLAG_FIELDS if hasattr(logging, flag)
+}
+
+# 生存中のLoggerインスタンスごとの(フォーマットで参照する属性, 呼び出し元の情報を省くか)
+# インスタンスが回収されるとエントリは自動で消える
+_RECORD_FIELD_USERS: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+# マルチプロセスモードのQueue・ポンプスレッド・Listenerをプロセス内で共有するレジストリ
+# キー: (設定ファイルのパス, 更新時刻, queue_size)
+# 値の'users'は共有しているLoggerインスタンスの数（最後のstop()で停止する）
+_GLOBAL_MP: Dict[tuple, Dict[str, Any]] = {}
+
+
+def _reset_global_mp() -> None:
+    """fork後の子プロセスで、親プロセスのListenerスレッドを再利用しないようにする"""
+    _GLOBAL_MP.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_global_mp)
+
+
+def _stop_shared(shared: Dict[str, Any]) -> None:
+    """共有のポンプスレッドとListenerを停止"""
+    # 先にポンプスレッドを止め、ワーカーからの残りのレコードをlocal_queueへ流し切る
+    shared['log_queue'].put(None)
+    shared['pump_thread'].join()
+    shared['listener'].stop()
+
+
+def _stop_all_shared() -> None:
+    """
+    インタプリタ終了時に、stop()されずに残った共有のListenerを停止
+    
+    stop()を呼ばずに回収されたインスタンスの分は利用者数が減らないため、ここで停止する。
+    """
+    pid = os.getpid()
+    for key, shared in list(_GLOBAL_MP.items()):
+        if shared['owner_pid'] == pid:
+            del _GLOBAL_MP[key]
+            _stop_shared(shared)
+
+
+# インスタンスごとの終了時の停止（後に登録される）より後に実行される
+atexit.register(_stop_all_shared)
+
+# シングルプロセスモードのLoggerインスタンス間で共有するハンドラー
+# キー: 'config_key'（設定ファイルのパス, 更新時刻）、'handlers'（作成したハンドラーのリスト）
+_shared_handlers: Dict[str, Any] = {}
+
+# ログレベル名と数値の対応（設定の解析時に1回だけ引く）
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'WARN': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+    'FATAL': logging.CRITICAL,
+}
+
+# Loggerインスタンスごとの通し番号（id()と違い、GC後に再利用されない）
+_INSTANCE_IDS = itertools.count(1)
+
+# libyamlが利用可能であればCローダーを使用（純Python版より5〜10倍高速）
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# orjsonが利用可能であればJSONの読み込み・書き出しに使用（標準のjsonより数倍高速）
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    設定ファイルを読み込んでパースする
+    
+    (パス, 更新時刻)をキーにキャッシュするため、同一プロセス内で
+    同じ設定ファイルから複数のLoggerを作成してもパースは1回で済む。
+    戻り値はインスタンス間で共有されるので変更しないこと。
+    """
+    suffix = Path(path_str).suffix.lower()
+    
+    if suffix in ['.yaml', '.yml']:
+        loads = functools.partial(yaml.load, Loader=_YamlLoader)
+    elif suffix == '.json':
+        loads = _json_loads
+    else:
+        raise ValueError(f"サポートされていないファイル形式: {suffix}")
+    
+    # バイト列のまま渡し、テキストI/Oのラッパーによるデコードを省く
+    with open(path_str, 'rb') as f:
+        return loads(f.read())
+
+
+def _pump_records(
+    source: multiprocessing.Queue,
+    destination: queue.SimpleQueue
+) -> None:
+    """ワーカープロセスからのレコードをプロセス内のキューへ転送する（Noneで終了）"""
+    while True:
+        record = source.get()
+        if record is None:
+            break
+        destination.put(record)
+
+
+class RawFileHandler(logging.Handler):
+    """
+    os.writeで直接追記するファイルハンドラー
+    
+    整形済みのメッセージをエンコードして1回のos.writeで書き込むため、
+    テキストI/Oのラッパーを経由しない。O_APPENDで開いたファイルへの
+    1回の書き込みとなるので、handle()ではハンドラーのロックを取得せずにemitする
+    （マルチプロセスモードではQueueListenerのスレッドのみが書き込む）。
+    ロック自体は通常どおり作成し、close()等では使用する。
+    """
+    
+    def __init__(self, filename: str, mode: str = 'a', encoding: str = 'utf-8'):
+        """
+        RawFileHandlerの初期化
+        
+        Args:
+            filename: 出力先のファイルパス
+            mode: 'a'（追記）または'w'（上書き）
+            encoding: メッセージのエンコーディング
+        """
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if mode == 'w':
+            flags |= os.O_TRUNC
+        self.fd: Optional[int] = os.open(self.baseFilename, flags, 0o644)
+    
+    def handle(self, record: logging.LogRecord) -> Union[bool, logging.LogRecord]:
+        """フィルターを適用し、ロックを取得せずにemitする"""
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):  # Python 3.12以降、フィルターはレコードを返せる
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """整形したレコードを1回のos.writeで書き込む"""
+        try:
+            msg = self.format(record) + '\n'
+            os.write(self.fd, msg.encode(self.encoding, 'replace'))
+        except Exception:
+            self.handleError(record)
+    
+    def close(self) -> None:
+        """ファイルディスクリプタを閉じる"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        super().close()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    1レコードを1行のJSONに整形するフォーマッター
+    
+    出力するキーは ts（作成時刻）、lvl（レベル名）、msg（メッセージ）、
+    name（ロガー名）。例外情報がある場合は exc を追加する。
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """レコードをJSON文字列に変換"""
+        payload = {
+            'ts': record.created,
+            'lvl': record.levelname,
+            'msg': record.getMessage(),
+            'name': record.name,
+        }
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exc'] = record.exc_text
+        return _json_dumps(payload)
+
+
+@dataclass(frozen=True, slots=True)
+class HandlerSpec:
+    """
+    ハンドラー1つ分の設定
+    
+    設定ファイルのパース時に1回だけ作成し、ハンドラーの作成時には
+    辞書の参照やレベル名の解決を繰り返さない。
+    """
+    name: str
+    type: str
+    level: int
+    format: str = DEFAULT_FORMAT
+    datefmt: str = DEFAULT_DATEFMT
+    filename: str = 'app.log'
+    mode: str = 'a'
+    encoding: str = 'utf-8'
+    max_bytes: int = 10485760  # 10MB
+    backup_count: Optional[int] = None  # 未指定時はハンドラーの種類ごとの既定値
+    when: str = 'midnight'
+    interval: int = 1
+    raw: bool = False  # fileでRawFileHandlerを使用するか
+    formatter_type: str = 'text'  # 'text'（formatの書式）または 'json'（JsonFormatter）
+    
+    @classmethod
+    def from_config(cls, name: str, handler_config: Dict[str, Any]) -> 'HandlerSpec':
+        """設定ファイルのハンドラー設定（辞書）からHandlerSpecを作成"""
+        formatter_config = handler_config.get('formatter', {})
+        return cls(
+            name=name,
+            type=handler_config.get('type', 'stream'),
+            level=_LEVELS[handler_config.get('level', 'INFO').upper()],
+            format=formatter_config.get('format', DEFAULT_FORMAT),
+            datefmt=formatter_config.get('datefmt', DEFAULT_DATEFMT),
+            filename=handler_config.get('filename', 'app.log'),
+            mode=handler_config.get('mode', 'a'),
+            encoding=handler_config.get('encoding', 'utf-8'),
+            max_bytes=handler_config.get('max_bytes', 10485760),
+            backup_count=handler_config.get('backup_count'),
+            when=handler_config.get('when', 'midnight'),
+            interval=handler_config.get('interval', 1),
+            raw=handler_config.get('raw', False),
+            formatter_type=handler_config.get('formatter_type', 'text'),
+        )
+
+
+@functools.lru_cache(maxsize=8)
+def _load_handler_specs(path_str: str, mtime_ns: int) -> Tuple[HandlerSpec, ...]:
+    """設定ファイルのハンドラー設定をHandlerSpecのタプルに変換（キャッシュされる）"""
+    config = _load_config_cached(path_str, mtime_ns)
+    return tuple(
+        HandlerSpec.from_config(name, handler_config)
+        for name, handler_config in config.get('handlers', {}).items()
+    )
+
+
+def _make_stream_handler(spec: HandlerSpec) -> logging.Handler:
+    """コンソール出力のハンドラーを作成"""
+    return logging.StreamHandler()
+
+
+def _make_file_handler(spec: HandlerSpec) -> logging.Handler:
+    """ファイル出力のハンドラーを作成"""
+    if spec.raw:
+        return RawFileHandler(spec.filename, mode=spec.mode, encoding=spec.encoding)
+    return logging.FileHandler(spec.filename, mode=spec.mode, encoding=spec.encoding)
+
+
+def _make_rotating_file_handler(spec: HandlerSpec) -> logging.Handler:
+    """サイズベースでローテーションするハンドラーを作成"""
+    return logging.handlers.RotatingFileHandler(
+        spec.filename,
+        maxBytes=spec.max_bytes,
+        backupCount=5 if spec.backup_count is None else spec.backup_count,
+        encoding=spec.encoding
+    )
+
+
+def _make_timed_rotating_file_handler(spec: HandlerSpec) -> logging.Handler:
+    """時間ベースでローテーションするハンドラーを作成"""
+    return logging.handlers.TimedRotatingFileHandler(
+        spec.filename,
+        when=spec.when,
+        interval=spec.interval,
+        backupCount=7 if spec.backup_count is None else spec.backup_count,
+        encoding=spec.encoding
+    )
+
+
+# (フォーマッターの種類, 書式, 日付書式)ごとに共有するFormatter
+_FORMATTER_CACHE: Dict[Tuple[str, str, str], logging.Formatter] = {}
+_FORMATTER_CACHE_LOCK = threading.Lock()
+
+
+def _get_formatter(spec: HandlerSpec) -> logging.Formatter:
+    """ハンドラー設定に対応するFormatterを取得（同じ書式であれば同じインスタンス）"""
+    key = (spec.formatter_type, spec.format, spec.datefmt)
+    formatter = _FORMATTER_CACHE.get(key)
+    if formatter is None:
+        with _FORMATTER_CACHE_LOCK:
+            formatter = _FORMATTER_CACHE.get(key)
+            if formatter is None:
+                if spec.formatter_type == 'json':
+                    formatter = JsonFormatter()
+                else:
+                    formatter = logging.Formatter(spec.format, datefmt=spec.datefmt)
+                _FORMATTER_CACHE[key] = formatter
+    return formatter
+
+
+# ハンドラーの種類（設定ファイルのtype）ごとの作成関数
+_HANDLER_FACTORIES = {
+    'stream': _make_stream_handler,
+    'file': _make_file_handler,
+    'rotating_file': _make_rotating_file_handler,
+    'timed_rotating_file': _make_timed_rotating_file_handler,
+}
+
+
+def _register_record_fields(owner: Any, format_strings, skip_caller_info: bool) -> None:
+    """
+    Loggerインスタンスがフォーマットで参照する属性を登録し、収集の設定を更新
+    
+    インスタンスが回収されると登録は外れ、設定も更新される。
+    """
+    refs = frozenset(
+        field for format_string in format_strings
+        for field in _FORMAT_FIELD_RE.findall(format_string)
+    )
+    _RECORD_FIELD_USERS[owner] = (refs, skip_caller_info)
+    weakref.finalize(owner, _apply_record_fields)
+    _apply_record_fields()
+
+
+def _apply_record_fields() -> None:
+    """
+    生存中のどのLoggerのフォーマットでも参照されないLogRecordの高コストな属性の収集を無効化
+    
+    スレッド情報・プロセス情報（multiprocessing.current_process()の呼び出し）は、
+    生存中のいずれかのLoggerが参照していれば元の設定に戻す。
+    呼び出し元のファイル名・行番号（スタック走査、logging._srcfile）は、
+    設定ファイルでskip_caller_info: trueを指定したLoggerがあり、かつどのLoggerも
+    参照していない場合のみ省く。loggingモジュール全体の設定のため、
+    生存中のLoggerがなくなると元の設定に戻す。
+    """
+    users = list(_RECORD_FIELD_USERS.values())
+    if not users:
+        for flag, original in _ORIGINAL_RECORD_FLAGS.items():
+            setattr(logging, flag, original)
+        logging._srcfile = _ORIGINAL_SRCFILE
+        return
+    
+    needed = frozenset().union(*(refs for refs, _ in users))
+    for flag, original in _ORIGINAL_RECORD_FLAGS.items():
+        setattr(logging, flag, original and bool(needed & _RECORD_FLAG_FIELDS[flag]))
+    
+    skip_caller_info = any(skip for _, skip in users) and not needed & _SOURCE_FIELDS
+    logging._srcfile = None if skip_caller_info else _ORIGINAL_SRCFILE
+
+
+class LossyQueueHandler(logging.handlers.QueueHandler):
+    """
+    キューが満杯に近づくと低レベルのレコードを破棄するQueueHandler
+    
+    キューの使用率がdiscarding_thresholdを超えている間、WARNING未満の
+    レコードは破棄して件数だけを数える。WARNING以上は破棄せず、
+    キューが満杯であれば空きが出るまでブロックする。
+    破棄した件数は、次に投入できたレコードの直前、またはflush()時に
+    WARNINGとして報告する（Logger.stop()・終了時のlogging.shutdownでflushされる）。
+    """
+    
+    def __init__(
+        self,
+        queue,
+        maxsize: int = -1,
+        discarding_threshold: float = 0.8
+    ):
+        """
+        LossyQueueHandlerの初期化
+        
+        Args:
+            queue: レコードの投入先キュー
+            maxsize: キューのサイズ（-1で無制限、破棄は行わない）
+            discarding_threshold: 破棄を開始するキュー使用率（0.0〜1.0）
+        """
+        super().__init__(queue)
+        self.maxsize = maxsize
+        self.discarding_threshold = discarding_threshold
+        self.dropped = 0
+    
+    def _fill_ratio(self) -> float:
+        """キューの使用率を取得（取得できない場合は0.0）"""
+        if self.maxsize <= 0:
+            return 0.0
+        try:
+            return self.queue.qsize() / self.maxsize
+        except NotImplementedError:
+            # macOSのmultiprocessing.Queueはqsize()に対応していない
+            return 0.0
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """使用率に応じてレコードを破棄またはキューへ投入"""
+        if (record.levelno < logging.WARNING
+                and self._fill_ratio() >= self.discarding_threshold):
+            self.dropped += 1
+            return
+        
+        if self.dropped:
+            report = self._make_drop_report(record.name)
+            self.dropped = 0
+            self._put(report)
+        
+        self._put(record)
+    
+    def _make_drop_report(self, name: str) -> logging.LogRecord:
+        """破棄件数を報告するWARNINGのレコードを作成"""
+        return logging.LogRecord(
+            name, logging.WARNING, __file__, 0,
+            f'キューが混雑しているため {self.dropped} 件のログを破棄しました',
+            None, None
+        )
+    
+    def flush(self) -> None:
+        """
+        未報告の破棄件数があればWARNINGとして投入する
+        
+        Listenerの停止後に呼ばれてもブロックしないよう、満杯の場合は
+        報告せずに件数を残す。
+        """
+        if not self.dropped:
+            return
+        report = self._make_drop_report(__name__)
+        try:
+            self.queue.put_nowait(report)
+        except queue.Full:
+            return
+        self.dropped = 0
+    
+    def _put(self, record: logging.LogRecord) -> None:
+        """ノンブロッキングで投入し、満杯ならWARNING以上のみブロックして待つ"""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self.dropped += 1
+            else:
+                self.queue.put(record, block=True)
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    1回の起床でまとめてレコードを処理するQueueListener
+    
+    キューから最大batch_size件をまとめて取り出して各ハンドラーで処理し、
+    flush_frequencyバッチごとにハンドラーをflushする。
+    レコードごとの起床とロック取得のコストをバッチ全体で償却する。
+    """
+    
+    def __init__(
+        self,
+        queue,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+        batch_size: int = 64,
+        flush_frequency: int = 1
+    ):
+        """
+        BatchingQueueListenerの初期化
+        
+        Args:
+            queue: レコードを取り出すキュー
+            handlers: レコードを処理するハンドラー
+            respect_handler_level: ハンドラーのレベルを考慮するか
+            batch_size: 1回の起床で処理する最大レコード数
+            flush_frequency: 何バッチごとにハンドラーをflushするか
+        """
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = max(1, batch_size)
+        self.flush_frequency = max(1, flush_frequency)
+    
+    def enqueue_sentinel(self) -> None:
+        """停止用の番兵を投入（上限付きのキューが満杯でも空きを待って投入する）"""
+        self.queue.put(self._sentinel)
+    
+    def _monitor(self) -> None:
+        """キューを監視し、取り出せるだけのレコードをまとめて処理する"""
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        batch_count = 0
+        stopped = False
+        
+        while not stopped:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for record in batch:
+                if record is self._sentinel:
+                    stopped = True
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    q.task_done()
+            
+            batch_count += 1
+            if stopped or batch_count % self.flush_frequency == 0:
+                for handler in self.handlers:
+                    handler.flush()
+
+
+class DirectListener(logging.handlers.QueueListener):
+    """
+    ハンドラーが1つだけの場合のQueueListener
+    
+    ハンドラーのループやバッチごとのflushを行わず、取り出したレコードを
+    唯一のハンドラーへそのまま渡す。flushは停止時にのみ行う
+    （StreamHandler系はemitごとにflushするため不要）。
+    """
+    
+    def enqueue_sentinel(self) -> None:
+        """停止用の番兵を投入（上限付きのキューが満杯でも空きを待って投入する）"""
+        self.queue.put(self._sentinel)
+    
+    def _monitor(self) -> None:
+        """キューを監視し、レコードを唯一のハンドラーで処理する"""
+        q = self.queue
+        handler = self.handlers[0]
+        sentinel = self._sentinel
+        respect_handler_level = self.respect_handler_level
+        has_task_done = hasattr(q, 'task_done')
+        
+        while True:
+            record = self.dequeue(True)
+            if record is sentinel:
+                if has_task_done:
+                    q.task_done()
+                break
+            if not respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+            if has_task_done:
+                q.task_done()
+        
+        handler.flush()
+
+
+def _remove_installed_handlers(logger: logging.Logger) -> None:
+    """Loggerクラスが登録したハンドラー（_installed_by付き）だけをロガーから取り除く"""
+    for handler in list(logger.handlers):
+        if getattr(handler, '_installed_by', None) is not None:
+            logger.removeHandler(handler)
+
+
+def _close_shared_handlers() -> None:
+    """共有ハンドラーをロガーから取り除いて閉じ、登録を削除する"""
+    handlers = _shared_handlers.pop('handlers', [])
+    _shared_handlers.pop('config_key', None)
+    if not handlers:
+        return
+    
+    loggers = [logging.getLogger()] + [
+        logger for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    for logger in loggers:
+        for handler in handlers:
+            if handler in logger.handlers:
+                logger.removeHandler(handler)
+    for handler in handlers:
+        handler.close()
+
+
+def _stop_at_exit(stop_ref: weakref.WeakMethod) -> None:
+    """インタプリタ終了時にLoggerを停止（既に回収されている場合は何もしない）"""
+    stop = stop_ref()
+    if stop is not None:
+        stop()
 
 
 class Logger:
@@ -26,13 +628,18 @@ class Logger:
         logger = logger_manager.get_logger('my_app')
         logger.info('Hello, World!')
         
+        # 非同期スレッドモード（シングルプロセスで低レイテンシーに出力したい場合）
+        with Logger('logging_config.yaml', async_mode='thread') as logger_manager:
+            logger = logger_manager.get_logger('my_app')
+            logger.info('I/OはListenerスレッドで行われます')
+        
         # マルチプロセスモード（正しいパターン）
         # メインプロセスでLoggerインスタンスを作成
         main_logger = Logger('logging_config.yaml', use_multiprocessing=True)
         
         # ワーカープロセスには共通のQueueを渡す
         def worker(log_queue):
-            worker_logger = Logger('logging_config.yaml', use_multiprocessing=True, log_queue=log_queue)
+            worker_logger = Logger.for_worker(log_queue, level='INFO')
             logger = worker_logger.get_logger('worker')
             logger.info('Hello from worker!')
         
@@ -41,142 +648,311 @@ class Logger:
         p.join()
         
         main_logger.stop()  # メインプロセスで停止
+    
+    注意: ガベージコレクション時には停止しないため、stop()を呼び出すか
+    コンテキストマネージャーを使用すること
+    注意: rootロガーやライブラリのロガーにはハンドラーを登録しない
+    （get_loggerで取得したロガーのみに登録し、伝播は設定ファイルのroot.propagateに従う）
     """
     
+    # インスタンスの__dict__を作らない（ワーカーごとに保持されるため）
+    # __weakref__はatexitに登録する弱参照のために必要
+    __slots__ = (
+        'config_path', 'async_mode', 'use_multiprocessing', 'queue_size',
+        'discarding_threshold', 'log_queue', 'local_queue', 'pump_thread',
+        'owner_pid', 'listener', 'handlers', 'config', 'handler_specs',
+        'root_level', 'config_key', 'is_listener_owner', 'instance_id',
+        'queue_handler', 'queue_handler_pid', 'effective_level',
+        '_debug_enabled', '_info_enabled', '_loggers', '_shared', '__weakref__',
+    )
+    
     def __init__(
         self, 
         config_path: Union[str, Path],
         use_multiprocessing: bool = False,
-        queue_size: int = -1,
-        log_queue: Optional[multiprocessing.Queue] = None
+        queue_size: int = 8192,
+        log_queue: Optional[multiprocessing.Queue] = None,
+        discarding_threshold: float = 0.8,
+        async_mode: Literal['off', 'thread', 'process'] = 'off'
     ):
         """
         Loggerクラスの初期化
         
         Args:
             config_path: ログ設定ファイルのパス（YAML or JSON）
-            use_multiprocessing: マルチプロセスモードを使用するか
+            use_multiprocessing: マルチプロセスモードを使用するか（async_mode='process'と同じ）
             queue_size: キューのサイズ（-1で無制限）
             log_queue: 既存のQueueを使用する場合に指定（ワーカープロセス用）
+            discarding_threshold: DEBUG/INFOの破棄を開始するキュー使用率
+            async_mode: 非同期出力のモード
+                'off': 呼び出し元のスレッドで直接ハンドラーを実行
+                'thread': プロセス内のキューとListenerスレッドで非同期に出力
+                'process': multiprocessing.Queueを使用したマルチプロセスモード
         """
-        self.config_path = Path(config_path)
-        self.use_multiprocessing = use_multiprocessing
+        if use_multiprocessing and async_mode == 'off':
+            async_mode = 'process'
+        if async_mode not in ('off', 'thread', 'process'):
+            raise ValueError(f"サポートされていないasync_mode: {async_mode}")
+        
+        self._init_attributes(config_path, async_mode, queue_size, discarding_threshold, log_queue)
+        
+        # 設定ファイルの読み込み
+        self._load_config()
+        
+        # どのLoggerのフォーマットでも使われないLogRecordの属性は収集しない
+        _register_record_fields(
+            self, self._format_strings(), bool(self.config.get('skip_caller_info', False))
+        )
+        
+        # is_debug_enabled等で参照する有効レベル（get_loggerで更新される）
+        self._set_enabled_level(logging.INFO if self.root_level is None else self.root_level)
+        
+        if self.async_mode == 'off':
+            # シングルプロセスモードでは同じ設定のインスタンス間でハンドラーを共有する
+            # （同じ設定で作成済みであれば、ハンドラーを作成せずに再利用する）
+            self._setup_shared_handlers()
+        elif self.async_mode == 'thread':
+            # 非同期スレッドモード: プロセス内のキューとListenerスレッドを使用
+            self._setup_handlers()
+            self._setup_async_thread()
+        elif log_queue is None:
+            # マルチプロセスモード（メイン）: 同じ設定のQueueとListenerがあれば再利用、なければ作成
+            self._setup_multiprocessing(queue_size)
+        # ワーカープロセスはQueueHandlerしか使わないため、ファイル等のハンドラーは作成しない
+        
+        if self.is_listener_owner or self._shared is not None:
+            # stop()の呼び忘れに備え、終了時に停止する（弱参照のためインスタンスは延命しない）
+            atexit.register(_stop_at_exit, weakref.WeakMethod(self.stop))
+    
+    def _init_attributes(
+        self,
+        config_path: Optional[Union[str, Path]],
+        async_mode: str,
+        queue_size: int,
+        discarding_threshold: float,
+        log_queue: Optional[multiprocessing.Queue]
+    ) -> None:
+        """インスタンス属性を初期値で設定"""
+        self.config_path: Optional[Path] = Path(config_path) if config_path is not None else None
+        self.async_mode = async_mode
+        self.use_multiprocessing = async_mode == 'process'
+        self.queue_size = queue_size
+        self.discarding_threshold = discarding_threshold
         self.log_queue: Optional[multiprocessing.Queue] = log_queue
+        self.local_queue: Optional[Union[queue.SimpleQueue, queue.Queue]] = None  # メインプロセス内専用のキュー
+        self.pump_thread: Optional[threading.Thread] = None
+        self.owner_pid: Optional[int] = None
         self.listener: Optional[logging.handlers.QueueListener] = None
         self.handlers: list = []
         self.config: Dict[str, Any] = {}
+        self.handler_specs: Tuple[HandlerSpec, ...] = ()
+        self.root_level: Optional[int] = None  # 設定ファイルのrootのレベル（未指定時はNone）
+        self.config_key: tuple = ()  # (設定ファイルのパス, 更新時刻)
         self.is_listener_owner: bool = False  # このインスタンスがListenerの所有者かどうか
+        self.instance_id: int = next(_INSTANCE_IDS)
+        self.queue_handler: Optional[LossyQueueHandler] = None  # 全ロガーで共有するQueueHandler
+        self.queue_handler_pid: Optional[int] = None
+        self.effective_level: int = logging.INFO
+        self._debug_enabled: bool = False
+        self._info_enabled: bool = True
+        # get_loggerで設定したロガー（logging.getLoggerのグローバルロックを避ける）
+        self._loggers: Dict[Optional[str], logging.Logger] = {}
+        # 利用している_GLOBAL_MPのエントリ（stop()で利用をやめるとNone）
+        self._shared: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def for_worker(
+        cls,
+        log_queue: multiprocessing.Queue,
+        level: str = 'INFO',
+        queue_size: int = 8192,
+        discarding_threshold: float = 0.8
+    ) -> 'Logger':
+        """
+        ワーカープロセス用のLoggerを軽量に作成
         
-        # 設定ファイルの読み込み
-        self._load_config()
+        設定ファイルの読み込みやハンドラーの作成を行わず、メインプロセスから
+        渡されたQueueへ送るQueueHandlerだけを使用する。
+        spawn方式（Windows等）でもワーカーの起動コストがほぼかからない。
         
-        # ハンドラーの設定
-        self._setup_handlers()
+        Args:
+            log_queue: メインプロセスから渡されたQueue
+            level: get_loggerで設定するログレベル
+            queue_size: メインプロセスで指定したキューのサイズ
+            discarding_threshold: DEBUG/INFOの破棄を開始するキュー使用率
         
-        # マルチプロセスモードの場合、QueueListenerを起動
-        if self.use_multiprocessing and log_queue is None:
-            # log_queueが渡されていない場合のみ、新しいQueueとListenerを作成
-            self._setup_multiprocessing(queue_size)
-            self.is_listener_owner = True
+        Returns:
+            ワーカープロセス用のLogger
+        """
+        instance = cls.__new__(cls)
+        instance._init_attributes(None, 'process', queue_size, discarding_threshold, log_queue)
+        instance.config = {'root': {'level': level.upper()}}
+        instance.root_level = _LEVELS[level.upper()]
+        instance._set_enabled_level(instance.root_level)
+        return instance
     
     def _load_config(self) -> None:
-        """設定ファイルを読み込む"""
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"設定ファイルが見つかりません: {self.config_path}")
-        
-        suffix = self.config_path.suffix.lower()
-        
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            if suffix in ['.yaml', '.yml']:
-                self.config = yaml.safe_load(f)
-            elif suffix == '.json':
-                self.config = json.load(f)
-            else:
-                raise ValueError(f"サポートされていないファイル形式: {suffix}")
+        """設定ファイルを読み込む（パース結果はプロセス内でキャッシュされる）"""
+        # exists()で事前に確認せず、stat()の失敗で判定する（システムコールを1回減らす）
+        try:
+            mtime_ns = self.config_path.stat().st_mtime_ns
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"設定ファイルが見つかりません: {self.config_path}") from e
+        self.config_key = (str(self.config_path.resolve()), mtime_ns)
+        self.config = _load_config_cached(*self.config_key)
+        self.handler_specs = _load_handler_specs(*self.config_key)
+        root_level = self.config.get('root', {}).get('level')
+        self.root_level = None if root_level is None else _LEVELS[root_level.upper()]
+    
+    def _format_strings(self) -> list:
+        """設定ファイル内のすべてのハンドラーのフォーマット文字列を取得（JSON形式は除く）"""
+        return [spec.format for spec in self.handler_specs if spec.formatter_type != 'json']
     
     def _setup_handlers(self) -> None:
         """設定ファイルに基づいてハンドラーを作成"""
-        handlers_config = self.config.get('handlers', {})
-        
-        for handler_name, handler_config in handlers_config.items():
-            handler = self._create_handler(handler_name, handler_config)
+        for spec in self.handler_specs:
+            handler = self._create_handler(spec)
             if handler:
                 self.handlers.append(handler)
     
-    def _create_handler(
-        self, 
-        handler_name: str, 
-        handler_config: Dict[str, Any]
-    ) -> Optional[logging.Handler]:
-        """個別のハンドラーを作成"""
-        handler_type = handler_config.get('type', 'stream')
-        level = handler_config.get('level', 'INFO')
-        formatter_config = handler_config.get('formatter', {})
+    def _setup_shared_handlers(self) -> None:
+        """
+        同じ設定ファイルのインスタンス間で共有するハンドラーを作成
         
-        handler = None
-        
-        if handler_type == 'stream':
-            handler = logging.StreamHandler()
-        elif handler_type == 'file':
-            filename = handler_config.get('filename', 'app.log')
-            mode = handler_config.get('mode', 'a')
-            encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.FileHandler(filename, mode=mode, encoding=encoding)
-        elif handler_type == 'rotating_file':
-            filename = handler_config.get('filename', 'app.log')
-            max_bytes = handler_config.get('max_bytes', 10485760)  # 10MB
-            backup_count = handler_config.get('backup_count', 5)
-            encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.handlers.RotatingFileHandler(
-                filename, 
-                maxBytes=max_bytes, 
-                backupCount=backup_count,
-                encoding=encoding
-            )
-        elif handler_type == 'timed_rotating_file':
-            filename = handler_config.get('filename', 'app.log')
-            when = handler_config.get('when', 'midnight')
-            interval = handler_config.get('interval', 1)
-            backup_count = handler_config.get('backup_count', 7)
-            encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.handlers.TimedRotatingFileHandler(
-                filename,
-                when=when,
-                interval=interval,
-                backupCount=backup_count,
-                encoding=encoding
-            )
+        同じ設定ファイルのハンドラーが作成済みであれば、それを再利用する
+        （ファイルを開き直さない）。ハンドラーはget_loggerで取得したロガーにのみ
+        登録し、rootロガーには登録しない。
+        """
+        if _shared_handlers.get('config_key') == self.config_key:
+            self.handlers = list(_shared_handlers['handlers'])
+            return
         
-        if handler:
-            # レベルの設定
-            handler.setLevel(getattr(logging, level.upper()))
-            
-            # フォーマッターの設定
-            format_string = formatter_config.get(
-                'format', 
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            date_format = formatter_config.get('datefmt', '%Y-%m-%d %H:%M:%S')
-            formatter = logging.Formatter(format_string, datefmt=date_format)
-            handler.setFormatter(formatter)
+        # 別の設定（または更新された設定）のハンドラーは閉じて登録から外す
+        # （ファイル記述子を残さない）
+        _close_shared_handlers()
+        
+        self._setup_handlers()
+        for handler in self.handlers:
+            handler._installed_by = self.instance_id
+        
+        _shared_handlers['config_key'] = self.config_key
+        _shared_handlers['handlers'] = list(self.handlers)
+    
+    def _create_handler(self, spec: HandlerSpec) -> Optional[logging.Handler]:
+        """個別のハンドラーを作成（未知の種類の場合はNone）"""
+        factory = _HANDLER_FACTORIES.get(spec.type)
+        if factory is None:
+            return None
+        
+        handler = factory(spec)
+        
+        # レベルの設定（パース時に数値へ解決済み）
+        handler.setLevel(spec.level)
+        
+        # フォーマッターの設定（同じ書式のハンドラー間で共有）
+        handler.setFormatter(_get_formatter(spec))
         
         return handler
     
-    def _setup_multiprocessing(self, queue_size: int) -> None:
-        """マルチプロセス用のQueueとListenerを設定"""
-        # マルチプロセス対応のキューを作成
-        if queue_size == -1:
-            self.log_queue = multiprocessing.Queue()
-        else:
-            self.log_queue = multiprocessing.Queue(maxsize=queue_size)
+    def _create_listener(self, source_queue) -> logging.handlers.QueueListener:
+        """
+        設定ファイルのlistenerセクションに従ってQueueListenerを作成
+        
+        ハンドラーが1つだけの場合はDirectListenerを使用する。
+        """
+        if len(self.handlers) == 1:
+            return DirectListener(source_queue, *self.handlers, respect_handler_level=True)
         
-        # QueueListenerを作成して起動
-        self.listener = logging.handlers.QueueListener(
-            self.log_queue,
+        listener_config = self.config.get('listener', {})
+        return BatchingQueueListener(
+            source_queue,
             *self.handlers,
-            respect_handler_level=True
+            respect_handler_level=True,
+            batch_size=listener_config.get('batch_size', 64),
+            flush_frequency=listener_config.get('flush_frequency', 1)
         )
+    
+    def _setup_async_thread(self) -> None:
+        """
+        非同期スレッドモード用のQueueとListenerを設定
+        
+        プロセス内のSimpleQueueを使用するため、pickle化やパイプ、
+        フィーダースレッドのコストがかからない。ハンドラーの実行（I/O）は
+        Listenerスレッドで行われ、呼び出し元はキューへの投入のみで戻る。
+        """
+        self.log_queue = queue.SimpleQueue()
+        self.listener = self._create_listener(self.log_queue)
         self.listener.start()
+        self.is_listener_owner = True
+    
+    def _setup_multiprocessing(self, queue_size: int) -> None:
+        """
+        マルチプロセス用のQueueとListenerを設定
+        
+        multiprocessing.Queueはワーカープロセスからのレコード専用とし、
+        ポンプスレッドでプロセス内のSimpleQueueへ転送する。
+        メインプロセス自身のログはSimpleQueueへ直接投入するため、
+        pickle化とフィーダースレッドを経由しない。
+        
+        同じ設定ファイル・queue_sizeのQueueとListenerが既に起動していれば
+        それを再利用する（スレッドやパイプを増やさない）。共有しているインスタンスの
+        数を数え、最後のインスタンスのstop()で停止する（作成したインスタンスが
+        先に停止しても、他のインスタンスのレコードは引き続き出力される）。
+        """
+        key = self.config_key + (queue_size,)
+        shared = _GLOBAL_MP.get(key)
+        
+        if shared is None:
+            self._setup_handlers()
+            
+            # マルチプロセス対応のキューを作成
+            if queue_size == -1:
+                log_queue = multiprocessing.Queue()
+            else:
+                log_queue = multiprocessing.Queue(maxsize=queue_size)
+            
+            # メインプロセス内で使用するキュー（pickle不要）
+            # メインプロセスのLossyQueueHandlerも同じqueue_sizeで破棄を判断するため、
+            # 同じ上限を設ける（満杯の間はポンプスレッドが待ち、ワーカー側のQueueも詰まる）
+            if queue_size == -1:
+                local_queue = queue.SimpleQueue()
+            else:
+                local_queue = queue.Queue(maxsize=queue_size)
+            
+            # ワーカーからのレコードをlocal_queueへ転送するポンプスレッド
+            pump_thread = threading.Thread(
+                target=_pump_records,
+                args=(log_queue, local_queue),
+                daemon=True
+            )
+            pump_thread.start()
+            
+            # QueueListenerを作成して起動（local_queueのみを監視）
+            listener = self._create_listener(local_queue)
+            listener.start()
+            
+            shared = {
+                'log_queue': log_queue,
+                'local_queue': local_queue,
+                'pump_thread': pump_thread,
+                'listener': listener,
+                'handlers': self.handlers,
+                'owner_pid': os.getpid(),
+                'key': key,
+                'users': 0,
+            }
+            _GLOBAL_MP[key] = shared
+            self.is_listener_owner = True
+        
+        shared['users'] += 1
+        self._shared = shared
+        self.handlers = shared['handlers']
+        self.log_queue = shared['log_queue']
+        self.local_queue = shared['local_queue']
+        self.owner_pid = shared['owner_pid']
+        if self.is_listener_owner:
+            self.pump_thread = shared['pump_thread']
+            self.listener = shared['listener']
     
     def get_logger(self, name: str = None, level: str = 'INFO') -> logging.Logger:
         """
@@ -189,37 +965,125 @@ class Logger:
         Returns:
             設定されたロガーオブジェクト
         """
+        # このインスタンスで設定済みであれば再設定しない
+        # （他のインスタンスが設定し直した場合は、このインスタンスの設定に戻す）
+        logger = self._loggers.get(name)
+        if logger is not None and logger._configured_by_logger_cls == self.instance_id:
+            return logger
+        
         # ロガーの取得
         logger = logging.getLogger(name)
         
-        # レベルの設定（設定ファイルから取得、なければ引数の値を使用）
-        log_level = self.config.get('root', {}).get('level', level.upper())
-        logger.setLevel(getattr(logging, log_level))
+        if getattr(logger, '_configured_by_logger_cls', None) == self.instance_id:
+            self._loggers[name] = logger
+            return logger
         
-        # 既存のハンドラーをクリア（重複を避けるため）
-        logger.handlers.clear()
+        # レベルの設定（設定ファイルから取得、なければ引数の値を使用）
+        # setLevelはロガー階層全体のキャッシュをクリアするため、値が変わる時だけ呼ぶ
+        log_level = _LEVELS[level.upper()] if self.root_level is None else self.root_level
+        if logger.level != log_level:
+            logger.setLevel(log_level)
+        self._set_enabled_level(logger.level)
         
-        if self.use_multiprocessing:
-            # マルチプロセスモード: QueueHandlerを使用
-            queue_handler = logging.handlers.QueueHandler(self.log_queue)
-            logger.addHandler(queue_handler)
+        # 以前にLoggerクラスが登録したハンドラーのみ置き換える（他所で追加されたハンドラーは残す）
+        _remove_installed_handlers(logger)
+        if self.async_mode != 'off':
+            # 非同期モード: 共有のQueueHandlerを使用
+            logger.addHandler(self._get_queue_handler())
         else:
-            # シングルプロセスモード: 直接ハンドラーを追加
+            # シングルプロセスモード: インスタンス間で共有するハンドラーを使用
             for handler in self.handlers:
                 logger.addHandler(handler)
         
         # 親ロガーへの伝播を防ぐ（設定による）
-        logger.propagate = self.config.get('root', {}).get('propagate', False)
+        propagate = self.config.get('root', {}).get('propagate', False)
+        if logger.propagate != propagate:
+            logger.propagate = propagate
+        
+        logger._configured_by_logger_cls = self.instance_id
+        self._loggers[name] = logger
         
         return logger
     
+    def _set_enabled_level(self, level: int) -> None:
+        """有効なログレベルを記録し、is_debug_enabled等のキャッシュを更新"""
+        self.effective_level = level
+        self._debug_enabled = level <= logging.DEBUG
+        self._info_enabled = level <= logging.INFO
+    
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        指定したレベルのログが出力されるかを取得
+        
+        無効なレベルのログのためにメッセージを組み立てないよう、
+        ループ内などでのガードに使用する。
+        
+        Args:
+            level: ログレベル（logging.DEBUG等）
+        
+        Returns:
+            出力される場合はTrue
+        """
+        return level >= self.effective_level
+    
+    @property
+    def is_debug_enabled(self) -> bool:
+        """DEBUGログが出力されるか（再設定時のみ更新されるキャッシュ値）"""
+        return self._debug_enabled
+    
+    @property
+    def is_info_enabled(self) -> bool:
+        """INFOログが出力されるか（再設定時のみ更新されるキャッシュ値）"""
+        return self._info_enabled
+    
+    def _get_queue_handler(self) -> LossyQueueHandler:
+        """このプロセス用の共有QueueHandlerを取得（初回のみ作成）"""
+        pid = os.getpid()
+        if self.queue_handler is None or self.queue_handler_pid != pid:
+            # Listenerを所有するプロセスではpickle不要のlocal_queueへ直接投入
+            if self.local_queue is not None and pid == self.owner_pid:
+                target_queue = self.local_queue
+            else:
+                target_queue = self.log_queue
+            # SimpleQueueは上限を持たないため、queue_sizeで破棄を判断しない
+            # （非同期スレッドモードでは、実在しない上限に対してDEBUG/INFOが破棄されてしまう）
+            if isinstance(target_queue, queue.SimpleQueue):
+                maxsize = -1
+            else:
+                maxsize = self.queue_size
+            self.queue_handler = LossyQueueHandler(
+                target_queue,
+                maxsize=maxsize,
+                discarding_threshold=self.discarding_threshold
+            )
+            self.queue_handler._installed_by = self.instance_id
+            self.queue_handler_pid = pid
+        return self.queue_handler
+    
     def stop(self) -> None:
         """
-        QueueListenerを停止（マルチプロセスモードの場合）
+        QueueListenerを停止（非同期スレッドモード・マルチプロセスモードの場合）
         プログラム終了時に呼び出すこと
-        注意: Listenerの所有者（メインプロセス）のみが停止できます
+        注意: マルチプロセスモードで共有しているQueueListenerは、共有している
+        インスタンスのうち最後にstop()したもの（メインプロセス）が停止します
         """
-        if self.listener and self.is_listener_owner:
+        # 未報告の破棄件数を、Listenerが止まる前に投入する
+        if self.queue_handler is not None and self.queue_handler_pid == os.getpid():
+            self.queue_handler.flush()
+        
+        shared, self._shared = self._shared, None
+        if shared is not None:
+            self.pump_thread = None
+            self.listener = None
+            # fork先の子プロセスや、既に停止されたエントリは停止しない
+            if shared['owner_pid'] != os.getpid() or _GLOBAL_MP.get(shared['key']) is not shared:
+                return
+            shared['users'] -= 1
+            if shared['users'] == 0:
+                # 共有レジストリから外し、以降のLoggerには新しいQueueとListenerを作成させる
+                del _GLOBAL_MP[shared['key']]
+                _stop_shared(shared)
+        elif self.listener and self.is_listener_owner:
             self.listener.stop()
             self.listener = None
     
@@ -230,7 +1094,3 @@ class Logger:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """コンテキストマネージャーのサポート"""
         self.stop()
-    
-    def __del__(self):
-        """デストラクタでリスナーを停止"""
-        self.stop()
@@ -5,19 +5,525 @@
 SingleProcessLoggerとMultiProcessLoggerを提供します。
 """
 
+import atexit
+import functools
 import logging
 import logging.handlers
-import multiprocessing
-import yaml
-import json
+import operator
+import os
+import queue
+import re
+import threading
+import weakref
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Union
 from abc import ABC, abstractmethod
 
+if TYPE_CHECKING:
+    import multiprocessing
+
+
+# yaml・json・multiprocessingは使う時まで読み込まない
+# （JSONの設定だけならPyYAMLを、シングルプロセスだけならmultiprocessingをimportしない）
+_yaml_load = None
+
+
+def _load_yaml(stream) -> Any:
+    """PyYAMLを初回使用時にimportし、YAMLを読み込む"""
+    global _yaml_load
+    if _yaml_load is None:
+        import yaml
+        # libyamlが利用可能であればCローダーを使用（純Python版より5〜10倍高速）
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        _yaml_load = functools.partial(yaml.load, Loader=loader)
+    return _yaml_load(stream)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    設定ファイルを読み込んでパースする
+    
+    (パス, 更新時刻, サイズ)をキーにキャッシュするため、同じ設定ファイルから
+    複数のLoggerを作成してもパースは1回で済む。
+    戻り値はインスタンス間で共有されるので変更しないこと。
+    """
+    suffix = Path(path_str).suffix.lower()
+    
+    if suffix in ['.yaml', '.yml']:
+        return _load_yaml_with_sidecar(Path(path_str), mtime_ns, size)
+    
+    with open(path_str, 'r', encoding='utf-8') as f:
+        if suffix == '.json':
+            import json
+            return json.load(f)
+        else:
+            raise ValueError(f"サポートされていないファイル形式: {suffix}")
+
+
+def _load_yaml_with_sidecar(path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    YAMLの設定ファイルを読み込む（JSONに変換したサイドカーファイルを利用）
+    
+    YAMLより高速にパースできるJSONのキャッシュ（<設定ファイル>.jsoncache）を
+    設定ファイルの横に作成する。キャッシュには変換元の(更新時刻, サイズ)を記録し、
+    設定ファイルと一致する場合のみ読み込む（git checkout等で古い更新時刻の
+    設定ファイルに戻された場合も、キャッシュの方が新しいという理由で使わない）。
+    キャッシュを書き込めない場合（読み取り専用のディレクトリ等）は無視する。
+    """
+    import json
+    
+    cache_path = path.with_suffix(path.suffix + '.jsoncache')
+    source = [mtime_ns, size]
+    try:
+        cached = json.loads(cache_path.read_bytes())
+        if cached['source'] == source:
+            return cached['config']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        config = _load_yaml(f)
+    
+    # 一時ファイルに書いてから置き換え、読み込み途中のキャッシュを見せない
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    try:
+        tmp_path.write_text(json.dumps({'source': source, 'config': config}), encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # 書き込めない、またはJSONで表現できない値（日付等）を含む場合はキャッシュしない
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return config
+
+
+# ログレベル名と数値の対応（getattr(logging, ...)による解決を避ける）
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'WARN': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+    'FATAL': logging.CRITICAL,
+}
+
+
+def _to_level(level: Union[str, int]) -> int:
+    """ログレベル名（または数値）を数値に変換"""
+    if isinstance(level, int):
+        return level
+    return _LEVELS[level.upper()]
+
+
+# %形式の置換フィールド（%(name)s, %(lineno)4d 等）
+# グループ1は'%%'のエスケープ、グループ2・3は属性名と変換指定。
+# どちらにも当てはまらない'%'（'%s'等）は全グループがNoneになる
+_FIELD_PATTERN = re.compile(r'%(?:(%)|\((\w+)\)([#0+ -]*\d*(?:\.\d+)?[diouxXeEfFgGcrsa]))?')
+
+
+class _FastFormatter(logging.Formatter):
+    """
+    書式文字列を事前に解析しておくFormatter
+    
+    '%(asctime)s - %(name)s'のような名前付きの書式を'%s - %s'という位置指定の
+    書式と属性名のitemgetterに変換しておき、レコードの__dict__からまとめて
+    値を取り出してタプルで置換する（辞書を引く%置換より高速）。
+    '%%'のエスケープはそのまま残す。%形式以外の書式や、名前付きでない'%s'等を
+    含む書式はlogging.Formatterの処理にそのまま任せる。
+    """
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%'):
+        super().__init__(fmt, datefmt=datefmt, style=style)
+        self._positional = None
+        matches = list(_FIELD_PATTERN.finditer(self._fmt)) if style == '%' else []
+        if style == '%' and all(m.group(1) or m.group(2) for m in matches):
+            names = [m.group(2) for m in matches if m.group(2)]
+            self._positional = _FIELD_PATTERN.sub(
+                lambda m: m.group(0) if m.group(1) else '%' + m.group(3), self._fmt
+            )
+            if names:
+                getter = operator.itemgetter(*names)
+                # itemgetterは名前が1つだと値をそのまま返すのでタプルに包む
+                self._values = getter if len(names) > 1 else (lambda d: (getter(d),))
+            else:
+                self._values = lambda d: ()
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        if self._positional is None:
+            return super().formatMessage(record)
+        try:
+            return self._positional % self._values(record.__dict__)
+        except KeyError as e:
+            raise ValueError('Formatting field not found in record: %s' % e)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_formatter(fmt: str, datefmt: str) -> logging.Formatter:
+    """
+    (format, datefmt)ごとに1つのFormatterを返す
+    
+    同じ書式のハンドラーが複数あってもFormatterは共有される。
+    共有されるので、返されたFormatterの属性は変更しないこと。
+    """
+    return _FastFormatter(fmt, datefmt=datefmt)
+
+
+# QueueListenerが1回の起床で処理する最大レコード数（環境変数で変更可能）
+_BATCH_MAX = int(os.environ.get('LOG_QUEUE_BATCH_SIZE', 256))
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    1回の起床でまとめてレコードを処理するQueueListener
+    
+    キューから最大batch_size件をまとめて取り出して各ハンドラーで処理し、
+    バッチごとにハンドラーをflushする。
+    """
+    
+    def __init__(
+        self,
+        queue,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+        batch_size: int = _BATCH_MAX
+    ):
+        """
+        BatchingQueueListenerの初期化
+        
+        Args:
+            queue: レコードを取り出すキュー
+            handlers: レコードを処理するハンドラー
+            respect_handler_level: ハンドラーのレベルを考慮するか
+            batch_size: 1回の起床で処理する最大レコード数
+        """
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = max(1, batch_size)
+    
+    def enqueue_sentinel(self) -> None:
+        """停止用の番兵を投入（上限付きのキューが満杯でも空きを待って投入する）"""
+        self.queue.put(self._sentinel)
+    
+    def _monitor(self) -> None:
+        """キューを監視し、取り出せるだけのレコードをまとめて処理する"""
+        q = self.queue
+        stopped = False
+        
+        while not stopped:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for record in batch:
+                if record is self._sentinel:
+                    stopped = True
+                else:
+                    self.handle(record)
+            
+            for handler in self.handlers:
+                handler.flush()
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    ローテーション判定のシステムコールを減らしたRotatingFileHandler
+    
+    標準のshouldRolloverはレコードごとにos.path.exists・os.path.isfileを呼ぶため、
+    サイズの比較を先に行い、上限に達した場合のみ通常ファイルかどうかを確認する。
+    ログファイルが削除・移動された場合もローテーションできるよう、確認結果は
+    キャッシュしない。
+    """
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """サイズの比較を先に行い、上限に達した場合のみ通常ファイルかを確認"""
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        msg = "%s\n" % self.format(record)
+        self.stream.seek(0, 2)
+        if self.stream.tell() + len(msg) < self.maxBytes:
+            return False
+        # 通常ファイル以外（/dev/null等）はローテーションしない（bpo-45401）
+        if os.path.exists(self.baseFilename) and not os.path.isfile(self.baseFilename):
+            return False
+        return True
+
+
+# バッファリングするファイルハンドラーのバッファサイズ
+_FILE_BUFFER_SIZE = 65536
+
+
+class _BufferedFileMixin:
+    """
+    ファイルハンドラーの書き込みをバッファリングするMixin
+    
+    通常のファイルハンドラーはレコードごとにflushするが、ERROR以上のレコード、
+    flush_intervalごとの定期flush、および明示的なflush()・close()の時のみ
+    ファイルへ書き出す。プロセスが異常終了した場合は直近のログが失われうる。
+    """
+    
+    _in_emit = False
+    _flush_stop: Optional[threading.Event] = None
+    
+    def _open(self):
+        """大きめのバッファでファイルを開く"""
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=_FILE_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+    
+    def start_periodic_flush(self, interval: float) -> None:
+        """interval秒ごとにflushするデーモンスレッドを起動"""
+        self._flush_stop = threading.Event()
+        thread = threading.Thread(target=self._flush_periodically, args=(interval,), daemon=True)
+        thread.start()
+    
+    def _flush_periodically(self, interval: float) -> None:
+        """close()されるまで定期的にflushする"""
+        while not self._flush_stop.wait(interval):
+            self.flush()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """レコードを書き込み、ERROR以上の場合のみ即座にflushする"""
+        # emitはハンドラーのロックを保持した状態で呼ばれるため、_in_emitは
+        # ロックを保持しているスレッドからしか見えない（flushもロックを取得してから参照する）
+        self._in_emit = True
+        try:
+            super().emit(record)
+        finally:
+            self._in_emit = False
+        if record.levelno >= logging.ERROR:
+            self.flush()
+    
+    def flush(self) -> None:
+        """
+        emit内から呼ばれた場合（レコードごとのflush）は何もしない
+        
+        他のスレッド（別のListener・定期flush）からの呼び出しは、ロックを取得する
+        ことでemitの終了を待ってからflushする（emit中という理由で読み飛ばさない）。
+        """
+        with self.lock:
+            if not self._in_emit:
+                super().flush()
+    
+    def close(self) -> None:
+        """定期flushを止めてからファイルを閉じる"""
+        if self._flush_stop is not None:
+            self._flush_stop.set()
+        super().close()
+
+
+class BufferedFileHandler(_BufferedFileMixin, logging.FileHandler):
+    """バッファリングするFileHandler"""
+
+
+class BufferedRotatingFileHandler(_BufferedFileMixin, FastRotatingFileHandler):
+    """バッファリングするRotatingFileHandler"""
+
+
+class BufferedTimedRotatingFileHandler(_BufferedFileMixin, logging.handlers.TimedRotatingFileHandler):
+    """バッファリングするTimedRotatingFileHandler"""
+
+
+# キューへ送るLogRecordに残す属性（Listener側のフォーマットで参照される標準の属性）
+_RECORD_FIELDS = (
+    'name', 'levelno', 'levelname', 'pathname', 'filename', 'module', 'lineno',
+    'funcName', 'created', 'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process',
+)
+
+# Listener側のFormatterが計算する属性（送る必要がない）
+_FORMATTER_FIELDS = ('message', 'asctime')
+
+# LogRecordが標準で持つ属性（taskNameは_RECORD_FIELDSに含まれないため除く）
+_STANDARD_RECORD_ATTRS = (
+    frozenset(logging.LogRecord('', 0, '', 0, '', None, None).__dict__) - {'taskName'}
+) | frozenset(_FORMATTER_FIELDS)
+
+# ハンドラーの書式を省略した場合の書式
+_DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def _extra_record_fields(config: Dict[str, Any]) -> Optional[tuple]:
+    """
+    設定のハンドラーの書式が参照する属性のうち、_RECORD_FIELDSに含まれないものを返す
+    
+    extraで追加された属性やtaskName（Python 3.12以降）を書式で使う場合に、
+    それらをキューへ送るレコードに含めるために使う。ハンドラーを作成しない
+    ワーカープロセスでも同じ結果になるよう、ハンドラーではなく設定から求める。
+    設定にhandlersがない（書式が分からない）場合はNoneを返す。
+    """
+    handlers_config = config.get('handlers')
+    if handlers_config is None:
+        return None
+    fields = []
+    for handler_config in handlers_config.values():
+        fmt = handler_config.get('formatter', {}).get('format', _DEFAULT_FORMAT)
+        for match in _FIELD_PATTERN.finditer(fmt):
+            field = match.group(2)
+            if field is None:
+                continue
+            if field not in _RECORD_FIELDS and field not in _FORMATTER_FIELDS and field not in fields:
+                fields.append(field)
+    return tuple(fields)
+
+
+class _FastQueueHandler(logging.handlers.QueueHandler):
+    """
+    ロックを取得せず、整形済みの最小限のレコードを送るQueueHandler
+    
+    キュー（multiprocessing.Queue・queue.SimpleQueue）自体がスレッドセーフなため、
+    Handler.handleによるレコードごとのロックの取得・解放を省く。
+    
+    サイズ制限のあるキューが満杯の場合、drop_on_fullがFalseであれば空くまで
+    呼び出し元を待たせ（メモリ使用量を抑える代わりにログ出力が遅れる）、
+    Trueであればレコードを破棄してdroppedに件数を数える。
+    
+    extra_fieldsにはListener側の書式が参照する標準以外の属性（extraで追加された
+    属性・taskName等）を指定する（_extra_record_fieldsで求める）。Noneの場合は
+    標準以外の属性をすべて送る。
+    """
+    
+    def __init__(self, queue, drop_on_full: bool = False, extra_fields: Optional[tuple] = ()):
+        super().__init__(queue)
+        self.drop_on_full = drop_on_full
+        self.extra_fields = extra_fields
+        self.dropped = 0  # drop_on_full時に破棄したレコード数
+    
+    def handle(self, record: logging.LogRecord) -> Union[bool, logging.LogRecord]:
+        """フィルターを適用し、ロックを取得せずにemitする"""
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):  # Python 3.12以降、フィルターはレコードを返せる
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        呼び出し元でメッセージを整形し、標準の属性だけを持つレコードを作成
+        
+        引数・例外情報は整形済みのmsgに含まれるため送らない。extraで追加された
+        属性は書式が参照するもの（extra_fields）だけを送るため、pickle化が軽く、
+        書式で使わないpickleできない値で失敗しない。
+        """
+        msg = self.format(record)
+        prepared = logging.LogRecord.__new__(logging.LogRecord)
+        prepared.__dict__.update({field: getattr(record, field, None) for field in _RECORD_FIELDS})
+        if self.extra_fields is None:
+            # 書式が分からない場合は標準以外の属性をすべて送る
+            prepared.__dict__.update(
+                {key: value for key, value in record.__dict__.items() if key not in _STANDARD_RECORD_ATTRS}
+            )
+        elif self.extra_fields:
+            values = record.__dict__
+            # レコードにない属性は送らない（Listener側で通常のFormatterと同じエラーになる）
+            prepared.__dict__.update(
+                {field: values[field] for field in self.extra_fields if field in values}
+            )
+        prepared.msg = msg
+        prepared.message = msg
+        prepared.args = None
+        prepared.exc_info = None
+        prepared.exc_text = None
+        prepared.stack_info = None
+        return prepared
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """キューへ送る（満杯時の動作はdrop_on_fullによる）"""
+        if not self.drop_on_full:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _make_stream_handler(handler_config: Dict[str, Any]) -> logging.Handler:
+    """コンソール出力のハンドラーを作成"""
+    return logging.StreamHandler()
+
+
+def _make_file_handler(handler_config: Dict[str, Any]) -> logging.Handler:
+    """ファイル出力のハンドラーを作成"""
+    handler_class = (
+        BufferedFileHandler if handler_config.get('buffered', False) else logging.FileHandler
+    )
+    return handler_class(
+        handler_config.get('filename', 'app.log'),
+        mode=handler_config.get('mode', 'a'),
+        encoding=handler_config.get('encoding', 'utf-8')
+    )
+
+
+def _make_rotating_file_handler(handler_config: Dict[str, Any]) -> logging.Handler:
+    """サイズベースでローテーションするハンドラーを作成"""
+    handler_class = (
+        BufferedRotatingFileHandler if handler_config.get('buffered', False)
+        else FastRotatingFileHandler
+    )
+    return handler_class(
+        handler_config.get('filename', 'app.log'),
+        maxBytes=handler_config.get('max_bytes', 10485760),  # 10MB
+        backupCount=handler_config.get('backup_count', 5),
+        encoding=handler_config.get('encoding', 'utf-8')
+    )
+
+
+def _make_timed_rotating_file_handler(handler_config: Dict[str, Any]) -> logging.Handler:
+    """時間ベースでローテーションするハンドラーを作成"""
+    handler_class = (
+        BufferedTimedRotatingFileHandler if handler_config.get('buffered', False)
+        else logging.handlers.TimedRotatingFileHandler
+    )
+    return handler_class(
+        handler_config.get('filename', 'app.log'),
+        when=handler_config.get('when', 'midnight'),
+        interval=handler_config.get('interval', 1),
+        backupCount=handler_config.get('backup_count', 7),
+        encoding=handler_config.get('encoding', 'utf-8')
+    )
+
+
+# ハンドラーの種類（設定ファイルのtype）ごとの作成関数
+_HANDLER_FACTORIES = {
+    'stream': _make_stream_handler,
+    'file': _make_file_handler,
+    'rotating_file': _make_rotating_file_handler,
+    'timed_rotating_file': _make_timed_rotating_file_handler,
+}
+
+
+def _stop_at_exit(stop_ref: weakref.WeakMethod) -> None:
+    """インタプリタ終了時にLoggerを停止（既に回収されている場合は何もしない）"""
+    stop = stop_ref()
+    if stop is not None:
+        stop()
+
+
+def _as_queue_list(log_queue) -> list:
+    """Queue（またはQueueのリスト）をQueueのリストに変換"""
+    if isinstance(log_queue, (list, tuple)):
+        return list(log_queue)
+    return [log_queue]
+
 
 class BaseLogger(ABC):
     """Loggerの基底クラス"""
     
+    # インスタンスの__dict__を作らない（サブクラスも__slots__を定義すること）
+    __slots__ = ('config_path', 'handlers', 'config', '_loggers')
+    
     def __init__(self, config_path: Union[str, Path]):
         """
         基底Loggerの初期化
@@ -28,6 +534,8 @@ class BaseLogger(ABC):
         self.config_path = Path(config_path)
         self.handlers: list = []
         self.config: Dict[str, Any] = {}
+        # get_loggerで設定済みのロガー（logging.getLoggerのグローバルロックを避ける）
+        self._loggers: Dict[tuple, logging.Logger] = {}
         
         # 設定ファイルの読み込み
         self._load_config()
@@ -36,19 +544,12 @@ class BaseLogger(ABC):
         self._setup_handlers()
     
     def _load_config(self) -> None:
-        """設定ファイルを読み込む"""
+        """設定ファイルを読み込む（パース結果はプロセス内でキャッシュされる）"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"設定ファイルが見つかりません: {self.config_path}")
         
-        suffix = self.config_path.suffix.lower()
-        
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            if suffix in ['.yaml', '.yml']:
-                self.config = yaml.safe_load(f)
-            elif suffix == '.json':
-                self.config = json.load(f)
-            else:
-                raise ValueError(f"サポートされていないファイル形式: {suffix}")
+        st = self.config_path.stat()
+        self.config = _parse_config(str(self.config_path.resolve()), st.st_mtime_ns, st.st_size)
     
     def _setup_handlers(self) -> None:
         """設定ファイルに基づいてハンドラーを作成"""
@@ -65,61 +566,30 @@ class BaseLogger(ABC):
         handler_config: Dict[str, Any]
     ) -> Optional[logging.Handler]:
         """個別のハンドラーを作成"""
-        handler_type = handler_config.get('type', 'stream')
+        factory = _HANDLER_FACTORIES.get(handler_config.get('type', 'stream'))
+        if factory is None:
+            return None
+        
         level = handler_config.get('level', 'INFO')
         formatter_config = handler_config.get('formatter', {})
+        handler = factory(handler_config)
         
-        handler = None
-        
-        if handler_type == 'stream':
-            handler = logging.StreamHandler()
-        elif handler_type == 'file':
-            filename = handler_config.get('filename', 'app.log')
-            mode = handler_config.get('mode', 'a')
-            encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.FileHandler(filename, mode=mode, encoding=encoding)
-        elif handler_type == 'rotating_file':
-            filename = handler_config.get('filename', 'app.log')
-            max_bytes = handler_config.get('max_bytes', 10485760)  # 10MB
-            backup_count = handler_config.get('backup_count', 5)
-            encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.handlers.RotatingFileHandler(
-                filename, 
-                maxBytes=max_bytes, 
-                backupCount=backup_count,
-                encoding=encoding
-            )
-        elif handler_type == 'timed_rotating_file':
-            filename = handler_config.get('filename', 'app.log')
-            when = handler_config.get('when', 'midnight')
-            interval = handler_config.get('interval', 1)
-            backup_count = handler_config.get('backup_count', 7)
-            encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.handlers.TimedRotatingFileHandler(
-                filename,
-                when=when,
-                interval=interval,
-                backupCount=backup_count,
-                encoding=encoding
-            )
+        if isinstance(handler, _BufferedFileMixin):
+            handler.start_periodic_flush(handler_config.get('flush_interval', 30))
         
-        if handler:
-            # レベルの設定
-            handler.setLevel(getattr(logging, level.upper()))
-            
-            # フォーマッターの設定
-            format_string = formatter_config.get(
-                'format', 
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            date_format = formatter_config.get('datefmt', '%Y-%m-%d %H:%M:%S')
-            formatter = logging.Formatter(format_string, datefmt=date_format)
-            handler.setFormatter(formatter)
+        # レベルの設定
+        handler.setLevel(_to_level(level))
+        
+        # フォーマッターの設定
+        format_string = formatter_config.get('format', _DEFAULT_FORMAT)
+        date_format = formatter_config.get('datefmt', '%Y-%m-%d %H:%M:%S')
+        formatter = _get_formatter(format_string, date_format)
+        handler.setFormatter(formatter)
         
         return handler
     
     @abstractmethod
-    def get_logger(self, name: str = None, level: str = 'INFO') -> logging.Logger:
+    def get_logger(self, name: str = None, level: Union[str, int] = 'INFO') -> logging.Logger:
         """
         ロガーを取得（各サブクラスで実装）
         
@@ -146,6 +616,8 @@ class SingleProcessLogger(BaseLogger):
         logger.info('Hello, World!')
     """
     
+    __slots__ = ()
+    
     def __init__(self, config_path: Union[str, Path]):
         """
         SingleProcessLoggerの初期化
@@ -155,34 +627,43 @@ class SingleProcessLogger(BaseLogger):
         """
         super().__init__(config_path)
     
-    def get_logger(self, name: str = None, level: str = 'INFO') -> logging.Logger:
+    def get_logger(self, name: str = None, level: Union[str, int] = 'INFO') -> logging.Logger:
         """
         ロガーを取得
         
         Args:
             name: ロガーの名前（Noneの場合はrootロガー）
-            level: ログレベル（'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'）
+            level: ログレベル（'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'、またはlogging.INFO等の数値）
         
         Returns:
             設定されたロガーオブジェクト
         """
+        # このインスタンスで設定済みの名前・レベルであれば再設定しない
+        # （setLevelはロガー階層全体のキャッシュをクリアするため）
+        cached = self._loggers.get((name, level))
+        if cached is not None:
+            return cached
+        
         # ロガーの取得
         logger = logging.getLogger(name)
         
         # レベルの設定
-        log_level = self.config.get('root', {}).get('level', level.upper())
-        logger.setLevel(getattr(logging, log_level))
-        
-        # 既存のハンドラーをクリア（重複を避けるため）
-        logger.handlers.clear()
+        log_level = _to_level(self.config.get('root', {}).get('level', level))
+        if logger.level != log_level:
+            logger.setLevel(log_level)
         
-        # ハンドラーを直接追加
-        for handler in self.handlers:
-            logger.addHandler(handler)
+        # ハンドラーを直接追加（既に同じハンドラーが設定されていれば何もしない）
+        if logger.handlers != self.handlers:
+            logger.handlers.clear()
+            for handler in self.handlers:
+                logger.addHandler(handler)
         
         # 親ロガーへの伝播を防ぐ
-        logger.propagate = self.config.get('root', {}).get('propagate', False)
+        propagate = self.config.get('root', {}).get('propagate', False)
+        if logger.propagate != propagate:
+            logger.propagate = propagate
         
+        self._loggers[(name, level)] = logger
         return logger
     
     def __enter__(self):
@@ -219,12 +700,26 @@ class MultiProcessLogger(BaseLogger):
         p.join()
         
         main_logger.stop()
+    
+    注意: ガベージコレクション時には停止しないため、stop()を呼び出すか
+    コンテキストマネージャーを使用すること
+    
+    num_queuesを2以上にすると、ワーカーはプロセスIDに応じて
+    いずれかのQueueへ送るため、Queueのロックの競合が分散される。
+    その場合get_queue()はQueueのリストを返す（from_queueにそのまま渡せる）。
     """
     
+    __slots__ = (
+        'log_queue', 'log_queues', 'listeners', 'is_owner', 'queue_handler', 'drop_on_full',
+        '__weakref__',
+    )
+    
     def __init__(
         self, 
         config_path: Union[str, Path],
-        queue_size: int = -1
+        queue_size: int = 10000,
+        num_queues: int = 1,
+        drop_on_full: bool = False
     ):
         """
         MultiProcessLogger（メインプロセス用）の初期化
@@ -232,94 +727,133 @@ class MultiProcessLogger(BaseLogger):
         Args:
             config_path: ログ設定ファイルのパス（YAML or JSON）
             queue_size: キューのサイズ（-1で無制限）
+                満杯になるとキューが空くまで待つ（drop_on_full=Trueの場合は破棄する）
+            num_queues: Queue（とQueueListener）の数
+            drop_on_full: キューが満杯の場合に待たずにレコードを破棄するか
         """
         super().__init__(config_path)
+        self.drop_on_full = drop_on_full
+        
+        import multiprocessing
         
         # マルチプロセス対応のキューを作成
         if queue_size == -1:
-            self.log_queue = multiprocessing.Queue()
+            self.log_queues = [multiprocessing.Queue() for _ in range(max(1, num_queues))]
         else:
-            self.log_queue = multiprocessing.Queue(maxsize=queue_size)
-        
-        # QueueListenerを作成して起動
-        self.listener = logging.handlers.QueueListener(
-            self.log_queue,
-            *self.handlers,
-            respect_handler_level=True
-        )
-        self.listener.start()
+            self.log_queues = [
+                multiprocessing.Queue(maxsize=queue_size) for _ in range(max(1, num_queues))
+            ]
+        self.log_queue = self.log_queues[0]
+        
+        # QueueごとにQueueListenerを作成して起動（ハンドラーは共有、レコードはバッチ単位で処理）
+        self.listeners = [
+            BatchingQueueListener(log_queue, *self.handlers, respect_handler_level=True)
+            for log_queue in self.log_queues
+        ]
+        for listener in self.listeners:
+            listener.start()
         self.is_owner = True  # このインスタンスがListenerの所有者
+        
+        # stop()の呼び忘れに備え、終了時に停止する（弱参照のためインスタンスは延命しない）
+        atexit.register(_stop_at_exit, weakref.WeakMethod(self.stop))
+        self.queue_handler: Optional[logging.handlers.QueueHandler] = None
     
     @classmethod
     def from_queue(
         cls, 
         config_path: Union[str, Path],
-        log_queue: multiprocessing.Queue
+        log_queue: Union['multiprocessing.Queue', List['multiprocessing.Queue']],
+        drop_on_full: bool = False
     ) -> 'MultiProcessLogger':
         """
         既存のQueueを使用してワーカープロセス用のLoggerを作成
         
         Args:
             config_path: ログ設定ファイルのパス
-            log_queue: メインプロセスから渡されたQueue
+            log_queue: メインプロセスから渡されたQueue（またはget_queue()が返すQueueのリスト）
+            drop_on_full: キューが満杯の場合に待たずにレコードを破棄するか
         
         Returns:
             ワーカープロセス用のMultiProcessLogger
         """
         instance = cls.__new__(cls)
         BaseLogger.__init__(instance, config_path)
-        instance.log_queue = log_queue
-        instance.listener = None
+        instance.log_queues = _as_queue_list(log_queue)
+        instance.log_queue = instance.log_queues[0]
+        instance.listeners = []
         instance.is_owner = False  # ワーカーはListenerの所有者ではない
+        instance.queue_handler = None
+        instance.drop_on_full = drop_on_full
         return instance
     
-    def get_logger(self, name: str = None, level: str = 'INFO') -> logging.Logger:
+    def _get_queue_handler(self) -> logging.handlers.QueueHandler:
+        """全ロガーで共有するQueueHandlerを取得（初回のみ作成、Queueはプロセスごとに選択）"""
+        if self.queue_handler is None:
+            log_queue = self.log_queues[os.getpid() % len(self.log_queues)]
+            self.queue_handler = _FastQueueHandler(
+                log_queue, self.drop_on_full, _extra_record_fields(self.config)
+            )
+        return self.queue_handler
+    
+    def get_logger(self, name: str = None, level: Union[str, int] = 'INFO') -> logging.Logger:
         """
         ロガーを取得
         
         Args:
             name: ロガーの名前（Noneの場合はrootロガー）
-            level: ログレベル
+            level: ログレベル（名前またはlogging.INFO等の数値）
         
         Returns:
             設定されたロガーオブジェクト
         """
+        # このインスタンスで設定済みの名前・レベルであれば再設定しない
+        # （setLevelはロガー階層全体のキャッシュをクリアするため）
+        cached = self._loggers.get((name, level))
+        if cached is not None:
+            return cached
+        
         # ロガーの取得
         logger = logging.getLogger(name)
         
         # レベルの設定
-        log_level = self.config.get('root', {}).get('level', level.upper())
-        logger.setLevel(getattr(logging, log_level))
-        
-        # 既存のハンドラーをクリア
-        logger.handlers.clear()
+        log_level = _to_level(self.config.get('root', {}).get('level', level))
+        if logger.level != log_level:
+            logger.setLevel(log_level)
         
-        # QueueHandlerを使用
-        queue_handler = logging.handlers.QueueHandler(self.log_queue)
-        logger.addHandler(queue_handler)
+        # 共有のQueueHandlerを使用（既に設定されていれば何もしない）
+        queue_handler = self._get_queue_handler()
+        if logger.handlers != [queue_handler]:
+            logger.handlers.clear()
+            logger.addHandler(queue_handler)
         
         # 親ロガーへの伝播を防ぐ
-        logger.propagate = self.config.get('root', {}).get('propagate', False)
+        propagate = self.config.get('root', {}).get('propagate', False)
+        if logger.propagate != propagate:
+            logger.propagate = propagate
         
+        self._loggers[(name, level)] = logger
         return logger
     
-    def get_queue(self) -> multiprocessing.Queue:
+    def get_queue(self) -> Union['multiprocessing.Queue', List['multiprocessing.Queue']]:
         """
         ログキューを取得（ワーカープロセスに渡すため）
         
         Returns:
-            マルチプロセス用のQueue
+            マルチプロセス用のQueue（num_queuesが2以上の場合はQueueのリスト）
         """
-        return self.log_queue
+        if len(self.log_queues) == 1:
+            return self.log_queue
+        return list(self.log_queues)
     
     def stop(self) -> None:
         """
         QueueListenerを停止
         注意: メインプロセス（所有者）のみが呼び出すこと
         """
-        if self.listener and self.is_owner:
-            self.listener.stop()
-            self.listener = None
+        if self.listeners and self.is_owner:
+            for listener in self.listeners:
+                listener.stop()
+            self.listeners = []
     
     def __enter__(self):
         """コンテキストマネージャーのサポート"""
@@ -328,7 +862,3 @@ class MultiProcessLogger(BaseLogger):
     def __exit__(self, exc_type, exc_val, exc_tb):
         """コンテキストマネージャーのサポート"""
         self.stop()
-    
-    def __del__(self):
-        """デストラクタでリスナーを停止"""
-        self.stop()
@@ -4,12 +4,19 @@ Logger クラスのテストコード
 単体テストとマルチプロセスのテストを含みます。
 """
 
+import gc
+import json
+import logging
+import os
+import queue
 import unittest
+import warnings
+import weakref
 import tempfile
 import shutil
 import multiprocessing
 from pathlib import Path
-from logger import Logger
+from logger import Logger, LossyQueueHandler, BatchingQueueListener, DirectListener, RawFileHandler, JsonFormatter
 
 
 class TestLogger(unittest.TestCase):
@@ -86,6 +93,234 @@ handlers:
         log_file = self.logs_dir / 'test.log'
         self.assertTrue(log_file.exists())
     
+    def test_multiprocessing_main_uses_local_queue(self):
+        """メインプロセスのログがpickle不要のlocal_queue経由で出力されるかのテスト"""
+        logger_manager = Logger(self.config_file, use_multiprocessing=True)
+        logger = logger_manager.get_logger('test_local_queue')
+        
+        queue_handler = logger.handlers[0]
+        self.assertIs(queue_handler.queue, logger_manager.local_queue)
+        # local_queueにもqueue_sizeの上限がある（破棄の判断と一致させる）
+        self.assertEqual(logger_manager.local_queue.maxsize, logger_manager.queue_size)
+        
+        logger.info('Local queue message')
+        logger_manager.stop()
+        
+        log_content = (self.logs_dir / 'test.log').read_text(encoding='utf-8')
+        self.assertIn('Local queue message', log_content)
+    
+    def test_worker_skips_handler_setup(self):
+        """ワーカー（log_queue指定）ではハンドラーを作成しないことのテスト"""
+        log_queue = multiprocessing.Queue()
+        worker_manager = Logger(self.config_file, use_multiprocessing=True, log_queue=log_queue)
+        
+        self.assertEqual(worker_manager.handlers, [])
+        self.assertFalse((self.logs_dir / 'test.log').exists())
+    
+    def test_for_worker(self):
+        """for_workerで作成したLoggerがQueueへ送るだけであることのテスト"""
+        log_queue = queue.Queue()
+        worker_manager = Logger.for_worker(log_queue, level='WARNING')
+        logger = worker_manager.get_logger('test_for_worker')
+        logger.info('出力されない')
+        logger.warning('ワーカーからのメッセージ')
+        
+        self.assertEqual(worker_manager.handlers, [])
+        self.assertIsNone(worker_manager.config_path)
+        record = log_queue.get_nowait()
+        self.assertEqual(record.getMessage(), 'ワーカーからのメッセージ')
+        self.assertTrue(log_queue.empty())
+    
+    def test_record_fields_follow_format(self):
+        """生存中のLoggerのフォーマットで参照される属性のみ収集されるかのテスト"""
+        saved = (logging.logThreads, logging.logProcesses, logging.logMultiprocessing, logging._srcfile)
+        
+        plain = Logger(self.config_file, use_multiprocessing=False)
+        self.assertFalse(logging.logThreads)
+        self.assertFalse(logging.logProcesses)
+        self.assertFalse(logging.logMultiprocessing)
+        # 呼び出し元の情報はskip_caller_infoを指定しない限り変更しない
+        self.assertIs(logging._srcfile, saved[3])
+        
+        # 別のLoggerが参照している間は、他のLoggerを作成しても無効化されない
+        fields_config = self.temp_dir / 'fields_config.yaml'
+        fields_config.write_text(
+            self.config_file.read_text(encoding='utf-8').replace(
+                '%(message)s', '%(process)d %(filename)s:%(lineno)d %(message)s'
+            ),
+            encoding='utf-8'
+        )
+        with_fields = Logger(fields_config, use_multiprocessing=False)
+        self.assertTrue(logging.logProcesses)
+        with_fields.get_logger('test_fields').info('Field message')
+        log_content = (self.logs_dir / 'test.log').read_text(encoding='utf-8')
+        self.assertIn('test_logger.py:', log_content)
+        
+        Logger(self.config_file, use_multiprocessing=False)
+        self.assertTrue(logging.logProcesses)
+        
+        # 参照しているLoggerが回収されると無効化される
+        del with_fields
+        gc.collect()
+        self.assertFalse(logging.logProcesses)
+        
+        # 生存中のLoggerがなくなると元の設定に戻る
+        del plain
+        gc.collect()
+        self.assertEqual(
+            (logging.logThreads, logging.logProcesses, logging.logMultiprocessing, logging._srcfile),
+            saved
+        )
+    
+    def test_skip_caller_info(self):
+        """skip_caller_info: trueを指定した場合のみ呼び出し元の情報を省くかのテスト"""
+        content = self.config_file.read_text(encoding='utf-8')
+        self.config_file.write_text('skip_caller_info: true\n' + content, encoding='utf-8')
+        
+        logger_manager = Logger(self.config_file, use_multiprocessing=False)
+        self.assertIsNone(logging._srcfile)
+        
+        del logger_manager
+        gc.collect()
+        self.assertIsNotNone(logging._srcfile)
+    
+    def test_raw_file_handler(self):
+        """raw: trueのファイルハンドラーがos.writeで出力するかのテスト"""
+        content = self.config_file.read_text(encoding='utf-8')
+        self.config_file.write_text(
+            content.replace("    mode: 'a'\n", "    mode: 'a'\n    raw: true\n"),
+            encoding='utf-8'
+        )
+        logger_manager = Logger(self.config_file, use_multiprocessing=True)
+        self.assertIsInstance(logger_manager.handlers[1], RawFileHandler)
+        
+        logger = logger_manager.get_logger('test_raw')
+        logger.info('Raw message 1')
+        logger.info('Raw message 2')
+        logger_manager.stop()
+        
+        log_lines = (self.logs_dir / 'test.log').read_text(encoding='utf-8').splitlines()
+        self.assertEqual(len(log_lines), 2)
+        self.assertTrue(log_lines[1].endswith('Raw message 2'))
+    
+    def test_raw_file_handler_handle(self):
+        """RawFileHandlerがロックを持ち、handle()でフィルターを適用して書き込むかのテスト"""
+        handler = RawFileHandler(str(self.logs_dir / 'raw.log'))
+        self.assertIsNotNone(handler.lock)
+        handler.addFilter(lambda record: record.getMessage() != 'filtered')
+        try:
+            for message in ('kept', 'filtered'):
+                handler.handle(logging.LogRecord('test_raw', logging.INFO, __file__, 0, message, None, None))
+        finally:
+            handler.close()
+        
+        self.assertEqual((self.logs_dir / 'raw.log').read_text(encoding='utf-8'), 'kept\n')
+    
+    def test_json_formatter(self):
+        """formatter_type: jsonのハンドラーが1行1JSONで出力するかのテスト"""
+        content = self.config_file.read_text(encoding='utf-8')
+        self.config_file.write_text(
+            content.replace("    mode: 'a'\n", "    mode: 'a'\n    formatter_type: json\n"),
+            encoding='utf-8'
+        )
+        logger_manager = Logger(self.config_file, use_multiprocessing=False)
+        self.assertIsInstance(logger_manager.handlers[1].formatter, JsonFormatter)
+        
+        logger = logger_manager.get_logger('test_json')
+        logger.info('JSON %s', 'メッセージ')
+        
+        log_lines = (self.logs_dir / 'test.log').read_text(encoding='utf-8').splitlines()
+        payload = json.loads(log_lines[0])
+        self.assertEqual(payload['msg'], 'JSON メッセージ')
+        self.assertEqual(payload['lvl'], 'INFO')
+        self.assertEqual(payload['name'], 'test_json')
+    
+    def test_formatter_shared(self):
+        """同じ書式のハンドラーがFormatterを共有するかのテスト"""
+        logger_manager = Logger(self.config_file, use_multiprocessing=False)
+        first, second = logger_manager.handlers
+        self.assertIs(first.formatter, second.formatter)
+    
+    def test_config_cache(self):
+        """同じ設定ファイルのパース結果が再利用され、更新時は再読み込みされるかのテスト"""
+        first = Logger(self.config_file, use_multiprocessing=False)
+        second = Logger(self.config_file, use_multiprocessing=False)
+        self.assertIs(first.config, second.config)
+        
+        # 設定ファイルを更新すると新しい内容が読み込まれる
+        content = self.config_file.read_text(encoding='utf-8')
+        self.config_file.write_text(content.replace('level: DEBUG', 'level: INFO', 1), encoding='utf-8')
+        os.utime(self.config_file, ns=(0, first.config_path.stat().st_mtime_ns + 1))
+        third = Logger(self.config_file, use_multiprocessing=False)
+        self.assertEqual(third.config['root']['level'], 'INFO')
+    
+    def test_multiprocessing_shares_queue_and_listener(self):
+        """同じ設定のマルチプロセスLoggerがQueueとListenerを共有するかのテスト"""
+        owner = Logger(self.config_file, use_multiprocessing=True)
+        second = Logger(self.config_file, use_multiprocessing=True)
+        
+        self.assertIs(second.log_queue, owner.log_queue)
+        self.assertIs(second.local_queue, owner.local_queue)
+        self.assertTrue(owner.is_listener_owner)
+        self.assertFalse(second.is_listener_owner)
+        
+        # 所有者が先に停止しても、共有している他のインスタンスがある間は停止しない
+        listener = owner.listener
+        owner.stop()
+        self.assertIsNotNone(listener._thread)
+        second.get_logger('test_shared').info('Shared listener message')
+        second.stop()  # 最後のインスタンスの停止で共有のListenerが停止する
+        self.assertIsNone(listener._thread)
+        
+        log_content = (self.logs_dir / 'test.log').read_text(encoding='utf-8')
+        self.assertIn('Shared listener message', log_content)
+        # 停止を繰り返しても利用者数は減らない
+        second.stop()
+        
+        # 所有者の停止後は新しいQueueとListenerが作成される
+        third = Logger(self.config_file, use_multiprocessing=True)
+        self.assertIsNot(third.log_queue, owner.log_queue)
+        self.assertTrue(third.is_listener_owner)
+        third.stop()
+    
+    def test_async_thread_mode(self):
+        """非同期スレッドモードのテスト"""
+        with Logger(self.config_file, async_mode='thread') as logger_manager:
+            self.assertIsInstance(logger_manager.log_queue, queue.SimpleQueue)
+            self.assertFalse(logger_manager.use_multiprocessing)
+            
+            logger = logger_manager.get_logger('test_async_thread')
+            self.assertIs(logger.handlers[0].queue, logger_manager.log_queue)
+            logger.info('Async thread message')
+        
+        log_content = (self.logs_dir / 'test.log').read_text(encoding='utf-8')
+        self.assertIn('Async thread message', log_content)
+    
+    def test_async_thread_mode_does_not_drop(self):
+        """非同期スレッドモード（上限のないSimpleQueue）ではqueue_sizeによる破棄を行わないことのテスト"""
+        with Logger(self.config_file, async_mode='thread', queue_size=10) as logger_manager:
+            logger = logger_manager.get_logger('test_async_thread_no_drop')
+            handler = logger.handlers[0]
+            self.assertEqual(handler.maxsize, -1)
+            
+            for i in range(100):
+                logger.info(f'No drop message {i}')
+            self.assertEqual(handler.dropped, 0)
+        
+        log_content = (self.logs_dir / 'test.log').read_text(encoding='utf-8')
+        self.assertIn('No drop message 99', log_content)
+        self.assertNotIn('件のログを破棄しました', log_content)
+    
+    def test_atexit_does_not_keep_instance_alive(self):
+        """終了時の停止処理の登録がインスタンスを延命しないことのテスト"""
+        logger_manager = Logger(self.config_file, async_mode='thread')
+        logger_manager.stop()
+        ref = weakref.ref(logger_manager)
+        del logger_manager
+        gc.collect()
+        
+        self.assertIsNone(ref())
+    
     def test_context_manager(self):
         """コンテキストマネージャーのテスト"""
         with Logger(self.config_file, use_multiprocessing=False) as logger_manager:
@@ -113,6 +348,98 @@ handlers:
         self.assertIn('logger1', log_content)
         self.assertIn('logger2', log_content)
     
+    def test_get_logger_is_idempotent(self):
+        """get_loggerを繰り返し呼んでもハンドラーが再作成されないことのテスト"""
+        logger_manager = Logger(self.config_file, use_multiprocessing=False)
+        
+        logger = logger_manager.get_logger('test_idempotent')
+        self.assertIs(logger_manager.get_logger('test_idempotent'), logger)
+        
+        # ハンドラーは取得したロガーに1回だけ登録され、伝播は設定ファイルに従う
+        self.assertEqual(logger.handlers, logger_manager.handlers)
+        self.assertFalse(logger.propagate)
+        
+        logger.info('Idempotent message')
+        log_content = (self.logs_dir / 'test.log').read_text(encoding='utf-8')
+        self.assertEqual(log_content.count('Idempotent message'), 1)
+    
+    def test_shared_handlers_reused(self):
+        """同じ設定のシングルプロセスモードLoggerがハンドラーを再利用し、rootには登録しないかのテスト"""
+        first = Logger(self.config_file, use_multiprocessing=False)
+        second = Logger(self.config_file, use_multiprocessing=False)
+        
+        self.assertEqual(second.handlers, first.handlers)
+        root_handlers = [h for h in logging.getLogger().handlers if hasattr(h, '_installed_by')]
+        self.assertEqual(root_handlers, [])
+        
+        second.get_logger('test_root_reused').info('Reused message')
+        log_lines = (self.logs_dir / 'test.log').read_text(encoding='utf-8').splitlines()
+        self.assertEqual(len(log_lines), 1)
+    
+    def test_replaced_shared_handlers_closed(self):
+        """別の設定で再設定すると、以前の共有ハンドラーが閉じられて取り除かれるかのテスト"""
+        first = Logger(self.config_file, use_multiprocessing=False)
+        logger = first.get_logger('test_replaced')
+        old_file_handler = next(h for h in first.handlers if isinstance(h, logging.FileHandler))
+        
+        other_config = self.temp_dir / 'other_config.yaml'
+        other_config.write_text(
+            self.config_file.read_text(encoding='utf-8').replace('test.log', 'other.log'),
+            encoding='utf-8'
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', ResourceWarning)
+            second = Logger(other_config, use_multiprocessing=False)
+            gc.collect()
+        
+        self.assertIsNone(old_file_handler.stream)
+        for handler in first.handlers:
+            self.assertNotIn(handler, logger.handlers)
+        
+        second.get_logger('test_replaced').info('Replaced message')
+        self.assertIn('Replaced message', (self.logs_dir / 'other.log').read_text(encoding='utf-8'))
+    
+    def test_other_loggers_not_captured(self):
+        """取得していないロガー（ライブラリ等）のログがファイルに出力されないかのテスト"""
+        logger_manager = Logger(self.config_file, use_multiprocessing=False)
+        logger_manager.get_logger('test_app').warning('App message')
+        logging.getLogger('test_third_party').warning('Library message')
+        
+        log_content = (self.logs_dir / 'test.log').read_text(encoding='utf-8')
+        self.assertIn('App message', log_content)
+        self.assertNotIn('Library message', log_content)
+    
+    def test_get_logger_keeps_foreign_handlers(self):
+        """他所で追加されたハンドラーがget_loggerで取り除かれないことのテスト"""
+        foreign = logging.NullHandler()
+        logging.getLogger('test_foreign').addHandler(foreign)
+        
+        with Logger(self.config_file, async_mode='thread') as logger_manager:
+            logger = logger_manager.get_logger('test_foreign')
+            self.assertIn(foreign, logger.handlers)
+            
+            # 別のインスタンスで再設定すると、以前のQueueHandlerだけが置き換わる
+            with Logger(self.config_file, async_mode='thread') as other_manager:
+                logger = other_manager.get_logger('test_foreign')
+                self.assertEqual(logger.handlers, [foreign, other_manager.queue_handler])
+    
+    def test_is_enabled_properties(self):
+        """is_debug_enabled等が設定レベルに追従するかのテスト"""
+        logger_manager = Logger(self.config_file, use_multiprocessing=False)
+        self.assertTrue(logger_manager.is_debug_enabled)
+        self.assertTrue(logger_manager.is_info_enabled)
+        
+        content = self.config_file.read_text(encoding='utf-8')
+        self.config_file.write_text(content.replace('level: DEBUG', 'level: WARNING', 1), encoding='utf-8')
+        mtime_ns = self.config_file.stat().st_mtime_ns
+        os.utime(self.config_file, ns=(mtime_ns, mtime_ns + 1))
+        
+        logger_manager = Logger(self.config_file, use_multiprocessing=False)
+        logger_manager.get_logger('test_enabled')
+        self.assertFalse(logger_manager.is_debug_enabled)
+        self.assertFalse(logger_manager.is_info_enabled)
+        self.assertTrue(logger_manager.is_enabled_for(logging.ERROR))
+    
     def test_log_levels(self):
         """ログレベルのテスト"""
         logger_manager = Logger(self.config_file, use_multiprocessing=False)
@@ -136,6 +463,123 @@ handlers:
         self.assertIn('CRITICAL message', log_content)
 
 
+class TestLossyQueueHandler(unittest.TestCase):
+    """LossyQueueHandlerのテスト"""
+    
+    def _make_record(self, level: int, msg: str) -> logging.LogRecord:
+        """テスト用のLogRecordを作成"""
+        return logging.LogRecord('test_lossy', level, __file__, 0, msg, None, None)
+    
+    def test_drops_low_levels_above_threshold(self):
+        """使用率が閾値を超えるとDEBUG/INFOのみ破棄されるかのテスト"""
+        log_queue = queue.Queue(maxsize=10)
+        handler = LossyQueueHandler(log_queue, maxsize=10, discarding_threshold=0.5)
+        
+        for i in range(5):
+            handler.handle(self._make_record(logging.INFO, f'filler {i}'))
+        handler.handle(self._make_record(logging.INFO, 'dropped'))
+        handler.handle(self._make_record(logging.DEBUG, 'dropped'))
+        handler.handle(self._make_record(logging.ERROR, 'kept'))
+        
+        messages = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+        self.assertNotIn('dropped', messages)
+        self.assertEqual(messages[-1], 'kept')
+        # 破棄件数はERRORの直前にWARNINGとして報告される
+        self.assertIn('2 件', messages[-2])
+        self.assertEqual(handler.dropped, 0)
+    
+    def test_unbounded_queue_never_drops(self):
+        """無制限キュー（maxsize=-1）では破棄しないことのテスト"""
+        log_queue = queue.SimpleQueue()
+        handler = LossyQueueHandler(log_queue, maxsize=-1)
+        
+        for i in range(100):
+            handler.handle(self._make_record(logging.DEBUG, f'message {i}'))
+        
+        self.assertEqual(log_queue.qsize(), 100)
+        self.assertEqual(handler.dropped, 0)
+    
+    def test_flush_reports_dropped(self):
+        """破棄件数がflush時に報告されるかのテスト（後続のレコードがない場合）"""
+        log_queue = queue.Queue(maxsize=10)
+        handler = LossyQueueHandler(log_queue, maxsize=10, discarding_threshold=0.5)
+        
+        for i in range(8):
+            handler.handle(self._make_record(logging.INFO, f'message {i}'))
+        self.assertEqual(handler.dropped, 3)
+        
+        handler.flush()
+        messages = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+        self.assertIn('3 件', messages[-1])
+        self.assertEqual(handler.dropped, 0)
+    
+    def test_flush_does_not_block_when_full(self):
+        """キューが満杯の場合、flushはブロックせずに件数を残すかのテスト"""
+        log_queue = queue.Queue(maxsize=1)
+        log_queue.put_nowait(self._make_record(logging.INFO, 'filler'))
+        handler = LossyQueueHandler(log_queue, maxsize=1)
+        handler.dropped = 2
+        
+        handler.flush()
+        self.assertEqual(handler.dropped, 2)
+
+
+class _RecordingHandler(logging.Handler):
+    """処理したレコードとflush回数を記録するテスト用ハンドラー"""
+    
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.flush_count = 0
+    
+    def emit(self, record):
+        self.records.append(record)
+    
+    def flush(self):
+        self.flush_count += 1
+
+
+class TestBatchingQueueListener(unittest.TestCase):
+    """BatchingQueueListenerのテスト"""
+    
+    def test_drains_all_records_in_batches(self):
+        """キュー内のレコードがまとめて処理され、バッチ単位でflushされるかのテスト"""
+        log_queue = queue.SimpleQueue()
+        handler = _RecordingHandler()
+        for i in range(10):
+            log_queue.put(logging.LogRecord('test_batch', logging.INFO, __file__, 0, f'message {i}', None, None))
+        
+        listener = BatchingQueueListener(log_queue, handler, batch_size=4)
+        # 番兵を先に投入し、バッチの区切りを決定的にする
+        listener.enqueue_sentinel()
+        listener.start()
+        listener.stop()
+        
+        self.assertEqual([r.getMessage() for r in handler.records], [f'message {i}' for i in range(10)])
+        # 10件 + 停止用の番兵 = 4件ずつ3バッチ
+        self.assertEqual(handler.flush_count, 3)
+
+
+
+class TestDirectListener(unittest.TestCase):
+    """DirectListenerのテスト"""
+    
+    def test_handles_records_with_single_handler(self):
+        """レベル未満のレコードを除いて処理し、停止時にのみflushするかのテスト"""
+        log_queue = queue.SimpleQueue()
+        handler = _RecordingHandler()
+        handler.setLevel(logging.INFO)
+        log_queue.put(logging.LogRecord('test_direct', logging.DEBUG, __file__, 0, 'debug', None, None))
+        log_queue.put(logging.LogRecord('test_direct', logging.INFO, __file__, 0, 'info', None, None))
+        
+        listener = DirectListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        listener.stop()
+        
+        self.assertEqual([r.getMessage() for r in handler.records], ['info'])
+        self.assertEqual(handler.flush_count, 1)
+
+
 def worker_for_test(config_path: str, log_queue: multiprocessing.Queue, process_id: int, result_queue: multiprocessing.Queue):
     """マルチプロセステスト用のワーカー関数"""
     try:
@@ -226,6 +670,9 @@ def run_tests():
     
     # テストを追加
     suite.addTests(loader.loadTestsFromTestCase(TestLogger))
+    suite.addTests(loader.loadTestsFromTestCase(TestLossyQueueHandler))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchingQueueListener))
+    suite.addTests(loader.loadTestsFromTestCase(TestDirectListener))
     suite.addTests(loader.loadTestsFromTestCase(TestLoggerMultiprocessing))
     
     # テストを実行
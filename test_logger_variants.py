@@ -0,0 +1,487 @@
+"""
+SingleProcessLogger・MultiProcessLogger（logger_separate.py）と
+UnifiedLogger（logger_unified.py）のテストコード
+
+両モジュールに共通の部品（設定の読み込み・フォーマッター・ハンドラー）は
+モジュールごとに同じテストを実行します。
+"""
+
+import json
+import logging
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import logger_separate
+import logger_unified
+
+
+class _CommonTests:
+    """両モジュールに共通の部品のテスト（moduleをサブクラスで指定）"""
+    
+    module = None
+    
+    def setUp(self):
+        """テストの前処理"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        """テストの後処理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write_yaml(self, content: str) -> Path:
+        """テスト用のYAMLの設定ファイルを作成"""
+        path = self.temp_dir / 'config.yaml'
+        path.write_text(content, encoding='utf-8')
+        return path
+    
+    def _load_with_sidecar(self, path: Path) -> dict:
+        """設定ファイルの現在の更新時刻・サイズでYAMLを読み込む"""
+        st = path.stat()
+        return self.module._load_yaml_with_sidecar(path, st.st_mtime_ns, st.st_size)
+    
+    def test_sidecar_used_when_source_matches(self):
+        """変換元の更新時刻・サイズが一致する場合にサイドカーが使われるかのテスト"""
+        path = self._write_yaml('root:\n  level: INFO\n')
+        self.assertEqual(self._load_with_sidecar(path), {'root': {'level': 'INFO'}})
+        
+        cache_path = self.temp_dir / 'config.yaml.jsoncache'
+        cached = json.loads(cache_path.read_text(encoding='utf-8'))
+        st = path.stat()
+        self.assertEqual(cached['source'], [st.st_mtime_ns, st.st_size])
+        
+        # サイドカーの内容が返される（YAMLはパースされない）
+        cached['config'] = {'from': 'sidecar'}
+        cache_path.write_text(json.dumps(cached), encoding='utf-8')
+        self.assertEqual(self._load_with_sidecar(path), {'from': 'sidecar'})
+    
+    def test_sidecar_ignored_for_restored_older_file(self):
+        """古い更新時刻の設定ファイルに戻された場合にサイドカーが使われないかのテスト"""
+        path = self._write_yaml('root:\n  level: INFO\n')
+        old_mtime_ns = path.stat().st_mtime_ns - 10_000_000_000
+        self._load_with_sidecar(path)
+        
+        # git checkout・cp -p等と同様に、内容を戻して更新時刻をキャッシュより古くする
+        path.write_text('root:\n  level: DEBUG\n', encoding='utf-8')
+        os.utime(path, ns=(old_mtime_ns, old_mtime_ns))
+        self.assertEqual(self._load_with_sidecar(path), {'root': {'level': 'DEBUG'}})
+    
+    def _make_record(self, level: int, msg: str) -> logging.LogRecord:
+        """テスト用のLogRecordを作成"""
+        return logging.LogRecord('test_variants', level, __file__, 0, msg, None, None)
+    
+    def test_buffered_file_handler_flushes_on_error(self):
+        """バッファリングするハンドラーがERROR以上とflush()の時のみ書き出すかのテスト"""
+        log_path = self.temp_dir / 'buffered.log'
+        handler = self.module.BufferedFileHandler(str(log_path), encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            handler.handle(self._make_record(logging.INFO, 'info'))
+            self.assertEqual(log_path.read_text(encoding='utf-8'), '')
+            
+            handler.handle(self._make_record(logging.ERROR, 'error'))
+            self.assertEqual(log_path.read_text(encoding='utf-8'), 'info\nerror\n')
+            
+            handler.handle(self._make_record(logging.INFO, 'later'))
+            handler.flush()
+            self.assertEqual(log_path.read_text(encoding='utf-8'), 'info\nerror\nlater\n')
+        finally:
+            handler.close()
+    
+    def test_buffered_flush_waits_for_other_threads_emit(self):
+        """他のスレッドのemit中に呼ばれたflushが読み飛ばされず、emitの終了後に書き出すかのテスト"""
+        log_path = self.temp_dir / 'buffered.log'
+        handler = self.module.BufferedFileHandler(str(log_path), encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            handler.handle(self._make_record(logging.INFO, 'buffered'))
+            
+            # 別のListenerスレッドがemit中の状態を作る
+            with handler.lock:
+                handler._in_emit = True
+                flusher = threading.Thread(target=handler.flush)
+                flusher.start()
+                flusher.join(0.2)
+                self.assertTrue(flusher.is_alive())
+                handler._in_emit = False
+            flusher.join()
+            
+            self.assertEqual(log_path.read_text(encoding='utf-8'), 'buffered\n')
+        finally:
+            handler.close()
+    
+    def test_fast_rotating_file_handler_rolls_over(self):
+        """FastRotatingFileHandlerがサイズ上限でローテーションするかのテスト"""
+        log_path = self.temp_dir / 'rotating.log'
+        handler = self.module.FastRotatingFileHandler(
+            str(log_path), maxBytes=20, backupCount=2, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            for i in range(3):
+                handler.handle(self._make_record(logging.INFO, f'message {i:03d}'))
+        finally:
+            handler.close()
+        
+        self.assertEqual(log_path.read_text(encoding='utf-8'), 'message 002\n')
+        self.assertEqual((self.temp_dir / 'rotating.log.1').read_text(encoding='utf-8'), 'message 001\n')
+        self.assertEqual((self.temp_dir / 'rotating.log.2').read_text(encoding='utf-8'), 'message 000\n')
+    
+    def test_fast_rotating_file_handler_after_file_removed(self):
+        """ログファイルが削除された後もローテーションを続けるかのテスト"""
+        log_path = self.temp_dir / 'rotating.log'
+        handler = self.module.FastRotatingFileHandler(
+            str(log_path), maxBytes=20, backupCount=1, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        try:
+            handler.handle(self._make_record(logging.INFO, 'message 000'))
+            os.remove(log_path)
+            # 削除されたファイル（開いたままのinode）に上限まで書き込む
+            handler.handle(self._make_record(logging.INFO, 'message 001'))
+            handler.handle(self._make_record(logging.INFO, 'message 002'))
+            handler.handle(self._make_record(logging.INFO, 'message 003'))
+        finally:
+            handler.close()
+        
+        self.assertEqual(log_path.read_text(encoding='utf-8'), 'message 003\n')
+    
+    def test_fast_rotating_file_handler_skips_non_regular_file(self):
+        """通常ファイル以外（/dev/null）はローテーションしないかのテスト"""
+        if not os.path.exists(os.devnull):
+            self.skipTest('os.devnull does not exist')
+        handler = self.module.FastRotatingFileHandler(os.devnull, maxBytes=1, encoding='utf-8')
+        try:
+            self.assertFalse(handler.shouldRollover(self._make_record(logging.INFO, 'message')))
+        finally:
+            handler.close()
+    
+    def test_fast_queue_handler_handle(self):
+        """_FastQueueHandlerがロックオブジェクトを残したまま、フィルターを適用してキューへ送るかのテスト"""
+        log_queue = queue.SimpleQueue()
+        handler = self.module._FastQueueHandler(log_queue)
+        self.assertIsNotNone(handler.lock)
+        
+        handler.addFilter(lambda record: record.getMessage() != 'filtered')
+        self.assertFalse(handler.handle(self._make_record(logging.INFO, 'filtered')))
+        self.assertTrue(handler.handle(self._make_record(logging.INFO, 'sent')))
+        
+        self.assertEqual(log_queue.get_nowait().getMessage(), 'sent')
+        self.assertTrue(log_queue.empty())
+        handler.close()
+    
+    def test_fast_queue_handler_sends_extra_fields(self):
+        """書式が参照するextraの属性がキューへ送るレコードに含まれるかのテスト"""
+        formatter = logging.Formatter('%(user)s %(levelname)s %(message)s')
+        config = {'handlers': {'console': {'formatter': {'format': formatter._fmt}}}}
+        extra_fields = self.module._extra_record_fields(config)
+        self.assertEqual(extra_fields, ('user',))
+        
+        log_queue = queue.SimpleQueue()
+        handler = self.module._FastQueueHandler(log_queue, extra_fields=extra_fields)
+        record = self._make_record(logging.INFO, 'hello')
+        record.user = 'alice'
+        record.unused = object()  # 書式で使わない属性は送らない
+        handler.handle(record)
+        
+        prepared = log_queue.get_nowait()
+        self.assertEqual(formatter.format(prepared), 'alice INFO hello')
+        self.assertFalse(hasattr(prepared, 'unused'))
+        handler.close()
+    
+    def test_fast_queue_handler_sends_all_extras_without_config(self):
+        """書式が分からない（設定にhandlersがない）場合に標準以外の属性をすべて送るかのテスト"""
+        extra_fields = self.module._extra_record_fields({})
+        self.assertIsNone(extra_fields)
+        
+        log_queue = queue.SimpleQueue()
+        handler = self.module._FastQueueHandler(log_queue, extra_fields=extra_fields)
+        record = self._make_record(logging.INFO, 'hello')
+        record.user = 'alice'
+        handler.handle(record)
+        
+        prepared = log_queue.get_nowait()
+        self.assertEqual(prepared.user, 'alice')
+        self.assertEqual(prepared.getMessage(), 'hello')
+        handler.close()
+    
+    def test_fast_formatter_matches_logging_formatter(self):
+        """_FastFormatterの出力がlogging.Formatterと一致するかのテスト"""
+        formats = [
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            '%(message)s',
+            '%%(name)s %(message)s',
+            '100%% %(levelname)-8s|%(lineno)4d|%(message)s',
+            '%(created)f %(msecs)03d %(relativeCreated).1f %(message)s',
+            '%(process)d %(thread)x %(name)r %(message)s',
+        ]
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError:
+            exc_info = sys.exc_info()
+        records = [
+            self._make_record(logging.WARNING, 'plain'),
+            logging.LogRecord('test_variants', logging.ERROR, __file__, 10, 'failed: %s', ('x',), exc_info),
+        ]
+        
+        for fmt in formats:
+            fast = self.module._FastFormatter(fmt, datefmt='%Y-%m-%d %H:%M:%S')
+            expected = logging.Formatter(fmt, datefmt='%Y-%m-%d %H:%M:%S')
+            for record in records:
+                with self.subTest(fmt=fmt, msg=record.msg):
+                    self.assertEqual(fast.format(record), expected.format(record))
+    
+    def test_fast_queue_handler_drops_when_full(self):
+        """drop_on_full指定時に満杯のキューへのレコードを破棄して数えるかのテスト"""
+        log_queue = queue.Queue(maxsize=1)
+        handler = self.module._FastQueueHandler(log_queue, drop_on_full=True)
+        handler.handle(self._make_record(logging.INFO, 'first'))
+        handler.handle(self._make_record(logging.INFO, 'second'))
+        
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual(log_queue.get_nowait().getMessage(), 'first')
+        self.assertTrue(log_queue.empty())
+        handler.close()
+    
+    def test_fast_queue_handler_blocks_when_full(self):
+        """drop_on_fullを指定しない場合に満杯のキューが空くまで待つかのテスト"""
+        log_queue = queue.Queue(maxsize=1)
+        handler = self.module._FastQueueHandler(log_queue)
+        handler.handle(self._make_record(logging.INFO, 'first'))
+        
+        sender = threading.Thread(target=handler.handle, args=(self._make_record(logging.INFO, 'second'),))
+        sender.start()
+        sender.join(0.2)
+        self.assertTrue(sender.is_alive())
+        
+        self.assertEqual(log_queue.get_nowait().getMessage(), 'first')
+        sender.join()
+        self.assertEqual(log_queue.get_nowait().getMessage(), 'second')
+        self.assertEqual(handler.dropped, 0)
+        handler.close()
+    
+    def _write_file_config(self, fmt: str = '%(message)s') -> tuple:
+        """ファイルへ出力する設定ファイルを作成し、(設定ファイル, ログファイル)のパスを返す"""
+        log_path = self.temp_dir / 'queue.log'
+        path = self.temp_dir / 'queue_config.yaml'
+        path.write_text(
+            'handlers:\n'
+            '  file:\n'
+            '    type: file\n'
+            f'    filename: {log_path.as_posix()}\n'
+            '    formatter:\n'
+            f"      format: '{fmt}'\n",
+            encoding='utf-8'
+        )
+        return path, log_path
+    
+    def _stop_main(self, main) -> None:
+        """メインプロセス用のLoggerを停止し、ハンドラーを閉じる"""
+        main.stop()
+        for handler in main.handlers:
+            handler.close()
+    
+    def test_bounded_process_queue(self):
+        """メインプロセスのQueueがqueue_sizeで制限されるかのテスト"""
+        config_path, _ = self._write_file_config()
+        main = self._make_main(config_path, queue_size=5)
+        try:
+            self.assertEqual(main.get_queue()._maxsize, 5)
+        finally:
+            self._stop_main(main)
+    
+    def test_stop_with_full_queue(self):
+        """上限に達したQueueでもstop()が空きを待って番兵を投入し、Listenerを停止するかのテスト"""
+        config_path, log_path = self._write_file_config()
+        main = self._make_main(config_path, queue_size=2)
+        release = threading.Event()
+        
+        # Listenerを1件目の処理中に止めておき、その間にQueueを満杯にする
+        blocker = logging.Handler()
+        blocker.emit = lambda record: release.wait(5)
+        listener = main.listeners[0]
+        listener.handlers = listener.handlers + (blocker,)
+        log_queue = main.get_queue()
+        sender = self.module._FastQueueHandler(log_queue, drop_on_full=True)
+        for i in range(3):
+            sender.handle(self._make_record(logging.INFO, f'message {i}'))
+        deadline = time.monotonic() + 5
+        while sender.dropped == 0 and time.monotonic() < deadline:
+            sender.handle(self._make_record(logging.INFO, 'filler'))
+        self.assertGreater(sender.dropped, 0)
+        
+        errors = []
+        
+        def stop():
+            try:
+                main.stop()
+            except Exception as e:
+                errors.append(e)
+        
+        stopper = threading.Thread(target=stop)
+        stopper.start()
+        stopper.join(0.2)
+        self.assertTrue(stopper.is_alive())
+        
+        release.set()
+        stopper.join(5)
+        self.assertFalse(stopper.is_alive())
+        self.assertEqual(errors, [])
+        self.assertEqual(main.listeners, [])
+        for handler in main.handlers:
+            handler.close()
+        self.assertIn('message 0', log_path.read_text(encoding='utf-8'))
+    
+    def test_sharded_queues(self):
+        """num_queuesごとにQueueとListenerが作成され、全てのQueueのレコードが出力されるかのテスト"""
+        config_path, log_path = self._write_file_config()
+        main = self._make_main(config_path, num_queues=3)
+        try:
+            queues = main.get_queue()
+            self.assertEqual(len(queues), 3)
+            self.assertEqual(len(main.listeners), 3)
+            
+            # ワーカーはプロセスIDに応じたQueueへ送る
+            worker = self._make_worker(config_path, main)
+            worker_logger = worker.get_logger('test_variants.sharded')
+            worker_logger.info('from worker')
+            worker_logger.handlers.clear()
+            self.assertIs(worker.queue_handler.queue, queues[os.getpid() % 3])
+            
+            for index, log_queue in enumerate(queues):
+                self.module._FastQueueHandler(log_queue).handle(
+                    self._make_record(logging.INFO, f'queue {index}')
+                )
+        finally:
+            self._stop_main(main)
+        
+        lines = log_path.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(sorted(lines), ['from worker', 'queue 0', 'queue 1', 'queue 2'])
+    
+    def test_worker_sends_extra_fields(self):
+        """ワーカーがextraで渡した属性をキューへ送り、Listener側の書式で出力されるかのテスト"""
+        config_path, log_path = self._write_file_config('%(user)s|%(message)s')
+        main = self._make_main(config_path)
+        try:
+            worker = self._make_worker(config_path, main)
+            worker_logger = worker.get_logger('test_variants.extra')
+            worker_logger.info('from worker', extra={'user': 'alice'})
+            worker_logger.handlers.clear()
+        finally:
+            self._stop_main(main)
+        
+        self.assertEqual(log_path.read_text(encoding='utf-8'), 'alice|from worker\n')
+    
+    def test_get_logger_applies_new_level(self):
+        """同じ名前で別のレベルを指定した場合に、そのレベルが反映されるかのテスト"""
+        config_path, _ = self._write_file_config()
+        main = self._make_main(config_path)
+        try:
+            logger = main.get_logger('test_variants.level', 'INFO')
+            self.assertEqual(logger.level, logging.INFO)
+            self.assertIs(main.get_logger('test_variants.level', 'INFO'), logger)
+            
+            main.get_logger('test_variants.level', 'DEBUG')
+            self.assertEqual(logger.level, logging.DEBUG)
+            logger.handlers.clear()
+        finally:
+            self._stop_main(main)
+
+
+class TestSeparateCommon(_CommonTests, unittest.TestCase):
+    """logger_separate.pyの共通部品のテスト"""
+    
+    module = logger_separate
+    
+    def _make_main(self, config_path: Path, **kwargs):
+        """メインプロセス用のLoggerを作成"""
+        return logger_separate.MultiProcessLogger(config_path, **kwargs)
+    
+    def _make_worker(self, config_path: Path, main):
+        """ワーカープロセス用のLoggerを作成"""
+        return logger_separate.MultiProcessLogger.from_queue(config_path, main.get_queue())
+
+
+class TestUnifiedCommon(_CommonTests, unittest.TestCase):
+    """logger_unified.pyの共通部品のテスト"""
+    
+    module = logger_unified
+    
+    def _make_main(self, config_path: Path, **kwargs):
+        """メインプロセス用のLoggerを作成"""
+        return logger_unified.UnifiedLogger(config_path, use_multiprocessing=True, **kwargs)
+    
+    def _make_worker(self, config_path: Path, main):
+        """ワーカープロセス用のLoggerを作成"""
+        return logger_unified.UnifiedLogger(
+            config_path, use_multiprocessing=True, log_queue=main.get_queue(), config=main.config
+        )
+
+
+class TestBakeConfig(unittest.TestCase):
+    """bake_config（logger_unified.py）のテスト"""
+    
+    def setUp(self):
+        """テストの前処理"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        logger_unified._parse_config.cache_clear()
+    
+    def tearDown(self):
+        """テストの後処理"""
+        logger_unified._parse_config.cache_clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _parse(self, path: Path) -> dict:
+        """設定ファイルの現在の更新時刻・サイズで設定を読み込む"""
+        st = path.stat()
+        return logger_unified._parse_config(str(path), st.st_mtime_ns, st.st_size)
+    
+    def test_bake_and_load(self):
+        """bakeしたモジュールが設定ファイルの代わりに読み込まれるかのテスト"""
+        path = self.temp_dir / 'config.yaml'
+        path.write_text('root:\n  level: INFO\n', encoding='utf-8')
+        
+        baked_path = logger_unified.bake_config(path)
+        self.assertEqual(baked_path, self.temp_dir / 'config_yaml_baked.py')
+        self.assertEqual(self._parse(path), {'root': {'level': 'INFO'}})
+        
+        # bake済みモジュールの内容が返される（設定ファイルはパースされない）
+        baked_path.write_text(
+            baked_path.read_text(encoding='utf-8').replace("'INFO'", "'ERROR'"), encoding='utf-8'
+        )
+        logger_unified._parse_config.cache_clear()
+        self.assertEqual(self._parse(path), {'root': {'level': 'ERROR'}})
+    
+    def test_stale_bake_ignored(self):
+        """設定ファイルの変更後（古い更新時刻に戻された場合も含む）にbake済みモジュールが使われないかのテスト"""
+        path = self.temp_dir / 'config.yaml'
+        path.write_text('root:\n  level: INFO\n', encoding='utf-8')
+        old_mtime_ns = path.stat().st_mtime_ns - 10_000_000_000
+        logger_unified.bake_config(path)
+        
+        path.write_text('root:\n  level: DEBUG\n', encoding='utf-8')
+        self.assertEqual(self._parse(path), {'root': {'level': 'DEBUG'}})
+        
+        os.utime(path, ns=(old_mtime_ns, old_mtime_ns))
+        self.assertEqual(self._parse(path), {'root': {'level': 'DEBUG'}})
+    
+    def test_bake_paths_differ_by_suffix(self):
+        """拡張子だけが異なる設定ファイルのbake済みモジュールが別になるかのテスト"""
+        yaml_path = self.temp_dir / 'config.yaml'
+        yaml_path.write_text('root:\n  level: INFO\n', encoding='utf-8')
+        json_path = self.temp_dir / 'config.json'
+        json_path.write_text('{"root": {"level": "WARNING"}}', encoding='utf-8')
+        
+        self.assertNotEqual(logger_unified.bake_config(yaml_path), logger_unified.bake_config(json_path))
+        self.assertEqual(self._parse(yaml_path), {'root': {'level': 'INFO'}})
+        self.assertEqual(self._parse(json_path), {'root': {'level': 'WARNING'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,17 +3,602 @@
 
 マルチプロセスでQueueが共有されるかを検証するための実装
 結論：マルチプロセスではシングルトンでも共有されない
+（そのため、ワーカープロセスにはメインプロセスのQueueをlog_queueで渡す）
 """
 
+import functools
 import logging
 import logging.handlers
 import multiprocessing
-import yaml
+import multiprocessing.util
+import os
+import stat
+import sys
+import threading
+import time
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
 
 
+# orjsonが利用可能であればJSONの読み込み・書き出しに使用（標準のjsonより数倍高速）
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
+def _yaml_load(stream) -> Any:
+    """
+    YAMLをパースする（yamlはここで初めてインポートする）
+    
+    JSONのサイドカーを使える場合はyamlのインポート自体を省ける。
+    libyamlが利用可能であればCローダーを使用（yaml.safe_loadは純Python版のローダーを使う）。
+    """
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(stream, Loader=loader)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(parser, path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    設定ファイルを読み込んでパースする
+    
+    (パーサー, パス, 更新時刻, サイズ)をキーにキャッシュするため、reset()後に
+    作り直しても同じプロセス内でのパースは1回で済む。
+    戻り値はインスタンス間で共有されるので変更しないこと。
+    """
+    return parser(Path(path_str), mtime_ns, size)
+
+
+def _load_json(path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """JSONの設定ファイルを読み込む（バイト列のUTF-8をそのままパースする）"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _load_yaml_with_sidecar(path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    YAMLの設定ファイルを読み込む（JSONに変換したサイドカーファイルを利用）
+    
+    YAMLより高速にパースできるJSONのキャッシュ（<設定ファイル>.jsoncache）を
+    設定ファイルの横に作成する。キャッシュには変換元の(更新時刻, サイズ)を記録し、
+    設定ファイルと一致する場合のみ読み込む（git checkout等で古い更新時刻の
+    設定ファイルに戻された場合も、キャッシュの方が新しいという理由で使わない）。
+    spawnで起動されたワーカープロセスもこのキャッシュを読むだけで済む。
+    キャッシュを書き込めない場合（読み取り専用のディレクトリ等）は無視する。
+    """
+    cache_path = path.with_suffix(path.suffix + '.jsoncache')
+    source = [mtime_ns, size]
+    try:
+        cached = _json_loads(cache_path.read_bytes())
+        if cached['source'] == source:
+            return cached['config']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    # バイナリで開き、ローダー側でUTF-8をデコードする（テキストラッパーを挟まない）
+    with open(path, 'rb') as f:
+        config = _yaml_load(f)
+    
+    # 一時ファイルに書いてから置き換え、読み込み途中のキャッシュを見せない
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    try:
+        tmp_path.write_text(_json_dumps({'source': source, 'config': config}), encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # 書き込めない、またはJSONで表現できない値（日付等）を含む場合はキャッシュしない
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return config
+
+
+# 拡張子ごとのパーサー（インスタンスの初期化時に1回だけ選択する）
+_PARSERS = {
+    '.yaml': _load_yaml_with_sidecar,
+    '.yml': _load_yaml_with_sidecar,
+    '.json': _load_json,
+}
+
+
+# ログレベル名と数値の対応（getattr(logging, ...)による解決を避ける）
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'WARN': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+    'FATAL': logging.CRITICAL,
+}
+
+
+def _to_level(level: Union[str, int]) -> int:
+    """ログレベル名（または数値）を数値に変換"""
+    if isinstance(level, int):
+        return level
+    return _LEVELS[level.upper()]
+
+
+class _SecondCachedFormatter(logging.Formatter):
+    """
+    asctimeの整形結果を秒単位でキャッシュするFormatter
+    
+    datefmtにはミリ秒が含まれないため、同じ秒のレコードはtime.strftimeを省いて
+    直前の結果を使う（datefmt未指定の場合はミリ秒を付けるため通常の処理）。
+    """
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt=datefmt)
+        self._time_cache = (None, '')  # (秒, 整形結果) 複数スレッドから使われるため1回の代入で更新
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, text = self._time_cache
+        if second != cached_second:
+            text = time.strftime(datefmt, self.converter(second))
+            self._time_cache = (second, text)
+        return text
+
+
+@functools.lru_cache(maxsize=None)
+def _get_formatter(fmt: str, datefmt: str) -> logging.Formatter:
+    """
+    (format, datefmt)ごとに1つのFormatterを返す
+    
+    同じ書式のハンドラーが複数あってもFormatterは共有される。
+    共有されるので、返されたFormatterの属性は変更しないこと。
+    """
+    return _SecondCachedFormatter(fmt, datefmt=datefmt)
+
+
+# プロセスIDと出力の接頭辞（デバッグ出力・get_logger等のたびに取得・整形しないようにキャッシュ。
+# spawnではワーカーがモジュールを読み込み直し、forkでは_update_pidで更新される）
+_PID = os.getpid()
+_PID_PREFIX = f'[PID={_PID}]'
+
+
+def _update_pid() -> None:
+    """forkした子プロセスでプロセスIDのキャッシュを更新"""
+    global _PID, _PID_PREFIX
+    _PID = os.getpid()
+    _PID_PREFIX = f'[PID={_PID}]'
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_update_pid)
+
+
+def _debug(message: str) -> None:
+    """デバッグ出力（LoggerSingleton.DEBUGがTrueの場合のみ呼び出すこと）"""
+    sys.stderr.write(f'{_PID_PREFIX} {message}\n')
+
+
+# キューへ送るLogRecordに残す属性（Listener側のフォーマットで参照される標準の属性）
+_RECORD_FIELDS = (
+    'name', 'levelno', 'levelname', 'pathname', 'filename', 'module', 'lineno',
+    'funcName', 'created', 'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process',
+)
+
+
+class BatchingQueueHandler(logging.handlers.QueueHandler):
+    """
+    レコードをまとめてQueueへ送るQueueHandler
+    
+    capacity件たまるか、flush_level以上のレコードが来るか、flush_interval秒経つと
+    たまったレコードのリストを1回のputで送る（pickle化とパイプへの書き込みが
+    レコードごとではなくまとめて1回で済む）。受け取る側はBatchQueueListenerを使用すること。
+    close()の後に来たレコードは送らずに破棄する（Listenerの停止後にputすると、
+    SimpleQueueのパイプが埋まった時点で戻らなくなるため）。
+    """
+    
+    def __init__(
+        self,
+        queue,
+        capacity: int = 64,
+        flush_level: int = logging.ERROR,
+        flush_interval: float = 0.1
+    ):
+        super().__init__(queue)
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.buffer: list = []
+        self._closed = False
+        self._stop_flushing = threading.Event()
+        # 出力の少ないロガーのレコードが送られずに残らないよう、定期的にフラッシュする
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,), daemon=True
+        )
+        self._flusher.start()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        呼び出し元でメッセージを整形し、標準の属性だけを持つレコードを作成
+        
+        引数・例外情報は整形済みのmsgに含まれるため送らない。extraで追加された
+        属性も送らないため、pickle化が軽く、pickleできない値で失敗しない。
+        （標準のprepareはレコード全体をコピーし、msgとmessageの両方に整形結果を入れる）
+        """
+        msg = self.format(record)
+        prepared = logging.LogRecord.__new__(logging.LogRecord)
+        prepared.__dict__.update({field: getattr(record, field, None) for field in _RECORD_FIELDS})
+        prepared.msg = msg
+        prepared.args = None
+        prepared.exc_info = None
+        prepared.exc_text = None
+        prepared.stack_info = None
+        return prepared
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """バッファに追加し、条件を満たせばまとめて送る（emitからロックを取得した状態で呼ばれる）"""
+        if self._closed:
+            return
+        self.buffer.append(record)
+        if len(self.buffer) >= self.capacity or record.levelno >= self.flush_level:
+            self._send()
+    
+    def _send(self) -> None:
+        """バッファのレコードをリストで送る"""
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            # SimpleQueueにはput_nowaitがない（サイズ制限のあるQueueでは空くまで待つ）
+            self.queue.put(batch)
+    
+    def flush(self) -> None:
+        """バッファのレコードを送る"""
+        self.acquire()
+        try:
+            self._send()
+        finally:
+            self.release()
+    
+    def _flush_periodically(self, interval: float) -> None:
+        """flush_interval秒ごとにフラッシュ（close()まで）"""
+        while not self._stop_flushing.wait(interval):
+            try:
+                self.flush()
+            except Exception:
+                # Queueが閉じられた後等は送れないため終了する
+                return
+    
+    def close(self) -> None:
+        """残りのレコードを送ってから閉じる（以降のレコードは破棄する）"""
+        self._stop_flushing.set()
+        self.acquire()
+        try:
+            if not self._closed:
+                self._send()
+                self._closed = True
+        finally:
+            self.release()
+        super().close()
+
+
+def _set_affinity(cpus) -> None:
+    """呼び出したスレッドの実行コアを設定する（未対応の環境・設定できないコアの場合は何もしない）"""
+    if not cpus or not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        os.sched_setaffinity(0, cpus)
+    except (OSError, ValueError, TypeError) as e:
+        if LoggerSingleton.DEBUG:
+            _debug(f"CPUアフィニティを設定できません: {e}")
+
+
+def _listener_cpu(config: Dict[str, Any]) -> Optional[int]:
+    """
+    設定のlistener_cpuをコア番号（0以上の整数）に変換する（未指定の場合はNone）
+    
+    YAMLで'0'のように文字列で書かれた場合も受け付ける。整数に変換できない値や
+    負の値はListenerのスレッドの中で失敗しないよう、設定の読み込み時にエラーにする。
+    """
+    value = config.get('listener_cpu')
+    if value is None:
+        return None
+    try:
+        cpu = int(value)
+    except (TypeError, ValueError):
+        cpu = -1
+    if isinstance(value, bool) or cpu < 0:
+        raise ValueError(f"listener_cpuには0以上のコア番号を指定してください: {value!r}")
+    return cpu
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    BatchingQueueHandlerが送ったレコードのリストを展開して処理するQueueListener
+    
+    multiprocessing.SimpleQueue（get・putに引数を取らない）にも対応する。
+    cpuを指定すると、Listenerのスレッドをそのコアに固定する（Linuxのみ）。
+    """
+    
+    def __init__(self, queue, *handlers, respect_handler_level: bool = False, cpu: Optional[int] = None):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.cpu = cpu
+    
+    def _monitor(self) -> None:
+        if self.cpu is not None:
+            # Linuxではpid=0で呼び出したスレッドだけが対象になる
+            _set_affinity({self.cpu})
+        super()._monitor()
+    
+    def dequeue(self, block: bool):
+        # _monitorからは常にblock=Trueで呼ばれる
+        return self.queue.get()
+    
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+    
+    def handle(self, record) -> None:
+        if not isinstance(record, list):
+            super().handle(record)
+            return
+        
+        records = [self.prepare(item) for item in record]
+        for handler in self.handlers:
+            if self.respect_handler_level:
+                batch = [item for item in records if item.levelno >= handler.level]
+            else:
+                batch = records
+            if isinstance(handler, WritevFileHandler):
+                # まとめて1回のシステムコールで書き込む
+                handler.handle_batch(batch)
+            else:
+                for item in batch:
+                    handler.handle(item)
+
+
+# 1回のwritevで渡すバッファ数の上限
+_IOV_MAX = os.sysconf('SC_IOV_MAX') if hasattr(os, 'sysconf') else 1024
+
+
+class WritevFileHandler(logging.FileHandler):
+    """
+    複数のレコードをまとめて書き込めるFileHandler
+    
+    handle_batchは整形した各行をos.writevで1回のシステムコールで書き込む
+    （os.writevがない環境ではまとめたバイト列を1回のos.writeで書き込む）。
+    エンコードはストリームと同じくencoding・errorsに従い、整形・エンコードに
+    失敗したレコードがあれば1件ずつemitする。1件ずつのemitは通常のFileHandlerと同じ。
+    """
+    
+    def handle_batch(self, records: list) -> None:
+        """フィルターを通ったレコードをまとめて書き込む"""
+        records = [record for record in records if self.filter(record)]
+        if not records:
+            return
+        
+        self.acquire()
+        try:
+            try:
+                encoding = self.encoding or 'utf-8'
+                errors = self.errors or 'strict'
+                lines = [
+                    (self.format(record) + self.terminator).encode(encoding, errors)
+                    for record in records
+                ]
+            except Exception:
+                # 失敗したレコードだけがemitのhandleErrorで報告されるよう、1件ずつ書き込む
+                for record in records:
+                    self.emit(record)
+                return
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                # ストリームのバッファに残っている分を先に書き出してからファイル記述子へ直接書き込む
+                self.stream.flush()
+                _write_all(self.stream.fileno(), lines)
+            except Exception:
+                self.handleError(records[-1])
+        finally:
+            self.release()
+
+
+def _write_all(fd: int, lines: list) -> None:
+    """バイト列のリストをすべて書き込む（一部だけ書き込まれた場合は残りを書き込む）"""
+    if not hasattr(os, 'writev'):
+        data = b''.join(lines)
+        while data:
+            data = data[os.write(fd, data):]
+        return
+    
+    while lines:
+        chunk = lines[:_IOV_MAX]
+        written = os.writev(fd, chunk)
+        total = sum(map(len, chunk))
+        if written < total:
+            # 書き込めなかった部分から続ける
+            rest = b''.join(chunk)[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+        lines = lines[len(chunk):]
+
+
+class CountingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    書き込んだバイト数を数えてローテーションを判定するRotatingFileHandler
+    
+    標準のshouldRolloverはレコードごとにos.path.exists・os.path.isfileを呼び、
+    ファイル末尾へのseekも行う。ファイルを開いた時に1回だけfstatでサイズと
+    通常ファイルかどうかを取得し、以降は書き込んだバイト数を加算して判定する
+    （外部からファイルを移動・切り詰めた場合は次のローテーションまで反映されない）。
+    """
+    
+    _size = 0
+    _is_regular_file = True
+    _pending_size = 0  # shouldRolloverで計算した、書き込み予定のレコードのバイト数
+    
+    def _open(self):
+        """ファイルを開き、現在のサイズと通常ファイルかどうかを取得"""
+        stream = super()._open()
+        st = os.fstat(stream.fileno())
+        self._size = st.st_size
+        # 通常ファイル以外（/dev/null等）はローテーションしない（bpo-45401）
+        self._is_regular_file = stat.S_ISREG(st.st_mode)
+        return stream
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """書き込み済みのバイト数とレコードのバイト数の合計で判定（システムコールなし）"""
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0 or not self._is_regular_file:
+            self._pending_size = 0
+            return False
+        msg = self.format(record) + self.terminator
+        self._pending_size = len(msg.encode(self.encoding or 'utf-8', self.errors or 'strict'))
+        return self._size + self._pending_size >= self.maxBytes
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """書き込み、書き込んだバイト数を加算"""
+        super().emit(record)
+        self._size += self._pending_size
+
+
+class DoubleBufferedFileHandler(logging.Handler):
+    """
+    2つのバッファを切り替えながら書き込み用のスレッドでファイルへ書き込むハンドラー（type: async_file）
+    
+    emitは整形したレコードを書き込み中でない方のバッファに追加するだけで戻る。
+    バッファがbuffer_sizeの75%を超えると書き込み用のスレッドへ渡し、もう一方のバッファに
+    切り替える（ディスクへの書き込み中もListenerはレコードを処理し続けられる）。
+    書き込み用のスレッドが前のバッファを書き終えていない場合は、終わるまで待つ
+    （書き込み用のスレッドが異常終了していた場合は、待たずに呼び出し元で書き込む）。
+    flush_interval秒ごとに、閾値に達していないバッファも書き込む。
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        mode: str = 'a',
+        encoding: str = 'utf-8',
+        buffer_size: int = 1 << 20,
+        flush_interval: float = 1.0
+    ):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self.terminator = '\n'
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        flags |= os.O_TRUNC if mode == 'w' else os.O_APPEND
+        self._fd = os.open(self.baseFilename, flags, 0o644)
+        self._watermark = buffer_size * 3 // 4
+        self._flush_interval = flush_interval
+        self._filling = bytearray()  # レコードを追加中のバッファ
+        self._spare: Optional[bytearray] = bytearray()  # 空きのバッファ
+        self._full: Optional[bytearray] = None  # 書き込み待ち・書き込み中のバッファ
+        self._closing = False
+        self._cond = threading.Condition()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """整形したレコードをバッファに追加する"""
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding)
+            with self._cond:
+                self._filling += data
+                if len(self._filling) >= self._watermark:
+                    self._hand_off()
+        except Exception:
+            self.handleError(record)
+    
+    def _hand_off(self) -> None:
+        """追加中のバッファを書き込み用のスレッドへ渡し、空きのバッファに切り替える（_condを取得して呼ぶ）"""
+        self._wait_written()
+        self._full, self._filling, self._spare = self._filling, self._spare, None
+        self._cond.notify_all()
+    
+    def _wait_written(self) -> None:
+        """
+        渡したバッファが書き込まれるまで待つ（_condを取得して呼ぶ）
+        
+        書き込み用のスレッドが終了している場合は待たずにこのスレッドで書き込む。
+        """
+        while self._full is not None:
+            if not self._writer.is_alive():
+                self._write_full()
+                return
+            self._cond.wait(self._flush_interval)
+    
+    def _write_full(self) -> None:
+        """書き込み用のスレッドの代わりに、渡したバッファを書き込む（_condを取得して呼ぶ）"""
+        buffer = self._full
+        try:
+            _write_all(self._fd, [buffer])
+        except OSError:
+            pass
+        buffer.clear()
+        self._full, self._spare = None, buffer
+    
+    def _writer_loop(self) -> None:
+        """渡されたバッファをファイルへ書き込む"""
+        while True:
+            with self._cond:
+                while self._full is None:
+                    if self._closing:
+                        return
+                    if not self._cond.wait(self._flush_interval) and self._filling:
+                        self._hand_off()
+                buffer = self._full
+            try:
+                _write_all(self._fd, [buffer])
+            except OSError:
+                # 書き込めなかった分は破棄する（ディスクフル等）
+                pass
+            with self._cond:
+                buffer.clear()
+                self._full, self._spare = None, buffer
+                self._cond.notify_all()
+    
+    def flush(self) -> None:
+        """追加中のバッファを書き込み、書き込みが終わるまで待つ"""
+        with self._cond:
+            if self._filling:
+                self._hand_off()
+            self._wait_written()
+    
+    def close(self) -> None:
+        """残りを書き込んでから書き込み用のスレッドを止め、ファイルを閉じる"""
+        if self._fd is None:
+            return
+        with self._cond:
+            if self._filling:
+                self._hand_off()
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+        with self._cond:
+            # 書き込み用のスレッドが異常終了していた場合の残り
+            if self._full is not None:
+                self._write_full()
+        os.close(self._fd)
+        self._fd = None
+        super().close()
+
+
+def _is_main_process() -> bool:
+    """
+    メインプロセス（multiprocessingで起動されたワーカーではない）かどうか
+    
+    forkの直後にはまだプロセス名が設定されていないため、プロセスIDのように
+    キャッシュはしない（初期化時にのみ呼ばれる）。
+    """
+    return multiprocessing.current_process().name == 'MainProcess'
+
+
 class LoggerSingleton:
     """
     シングルトンパターンで実装したLoggerクラス
@@ -24,20 +609,37 @@ class LoggerSingleton:
     実際には共有されません。
     """
     
+    # インスタンスの__dict__を作らない（サブクラスも__slots__を定義すること）
+    __slots__ = (
+        'config_path', 'use_multiprocessing', 'log_queue', 'listener', 'owner_pid',
+        'queue_handler', 'queue_handler_pid', 'handlers', 'config', '_loggers',
+        '_parse_cfg',
+    )
+    
+    # インスタンスと初期化済みフラグはクラス属性（__slots__のインスタンスには追加できない）
     _instance: Optional['LoggerSingleton'] = None
     _initialized: bool = False
+    _lock = threading.RLock()  # インスタンスの作成・初期化用（作成済みであれば取得しない）
+    
+    # Trueにすると初期化・Queue作成等の経過を標準エラー出力に表示する（検証用）
+    DEBUG: bool = False
     
     def __new__(cls, *args, **kwargs):
-        """シングルトンパターンの実装"""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        """シングルトンパターンの実装（ダブルチェックで、作成済みであればロックを取得しない）"""
+        instance = cls._instance
+        if instance is None:
+            with LoggerSingleton._lock:
+                instance = cls._instance
+                if instance is None:
+                    instance = cls._instance = super().__new__(cls)
+        return instance
     
     def __init__(
         self, 
         config_path: Union[str, Path] = None,
         use_multiprocessing: bool = False,
-        queue_size: int = -1
+        queue_size: int = -1,
+        log_queue: Optional[multiprocessing.Queue] = None
     ):
         """
         LoggerSingletonクラスの初期化
@@ -47,60 +649,151 @@ class LoggerSingleton:
         Args:
             config_path: ログ設定ファイルのパス（YAML or JSON）
             use_multiprocessing: マルチプロセスモードを使用するか
-            queue_size: キューのサイズ（-1で無制限）
+            queue_size: キューのサイズ（-1で無制限。無制限の場合はmultiprocessing.SimpleQueueを使用）
+            log_queue: メインプロセスのQueue（ワーカープロセスでは必須）
+                QueueListenerはメインプロセスでのみ起動し、ワーカープロセスは
+                このQueueへ送るだけにする（1つのListenerが全プロセスのログを書き込む）
         """
         # 既に初期化済みの場合はスキップ
-        if self._initialized:
-            print(f"[PID={multiprocessing.current_process().pid}] 既に初期化済み - インスタンスID: {id(self)}")
+        if type(self)._initialized:
+            if LoggerSingleton.DEBUG:
+                _debug(f"既に初期化済み - インスタンスID: {id(self)}")
             return
         
-        print(f"[PID={multiprocessing.current_process().pid}] 新規初期化 - インスタンスID: {id(self)}")
+        with LoggerSingleton._lock:
+            # 別のスレッドが先に初期化した場合はスキップ
+            if type(self)._initialized:
+                return
+            self._initialize(config_path, use_multiprocessing, queue_size, log_queue)
+    
+    def _initialize(
+        self,
+        config_path: Union[str, Path, None],
+        use_multiprocessing: bool,
+        queue_size: int,
+        log_queue: Optional[multiprocessing.Queue]
+    ) -> None:
+        """初回の初期化（_lockを取得して呼ぶ）"""
+        if LoggerSingleton.DEBUG:
+            _debug(f"新規初期化 - インスタンスID: {id(self)}")
         
         if config_path is None:
             raise ValueError("初回の初期化時にconfig_pathが必要です")
         
-        self.config_path = Path(config_path)
-        self.use_multiprocessing = use_multiprocessing
-        self.log_queue: Optional[multiprocessing.Queue] = None
-        self.listener: Optional[logging.handlers.QueueListener] = None
-        self.handlers: list = []
-        self.config: Dict[str, Any] = {}
+        self._init_attributes(Path(config_path), use_multiprocessing, log_queue)
         
-        # 設定ファイルの読み込み
+        # 設定ファイルの読み込み（listener_cpuの値はここで検証する）
         self._load_config()
+        listener_cpu = _listener_cpu(self.config)
         
-        # ハンドラーの設定
-        self._setup_handlers()
+        # ハンドラーの設定（ワーカープロセスはQueueへ送るだけのため作成しない。
+        # mode: 'w'のファイルをワーカーが開き直して切り詰めることもなくなる）
+        if not self.use_multiprocessing or _is_main_process():
+            self._setup_handlers()
         
         # マルチプロセスモードの場合、QueueListenerを起動
         if self.use_multiprocessing:
-            self._setup_multiprocessing(queue_size)
+            self._setup_multiprocessing(queue_size, listener_cpu)
+        
+        type(self)._initialized = True
+    
+    def _init_attributes(
+        self,
+        config_path: Optional[Path],
+        use_multiprocessing: bool,
+        log_queue: Optional[multiprocessing.Queue]
+    ) -> None:
+        """インスタンス属性を初期化（__init__とattach_workerで共通）"""
+        self.config_path = config_path
+        # 拡張子からパーサーを決めておく（未対応の形式は_load_configでエラーにする）
+        self._parse_cfg = (
+            _PARSERS.get(config_path.suffix.lower()) if config_path is not None else None
+        )
+        self.use_multiprocessing = use_multiprocessing
+        self.log_queue: Optional[multiprocessing.Queue] = log_queue
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.owner_pid: Optional[int] = None  # QueueListenerを起動したプロセスのID
+        self.queue_handler: Optional[BatchingQueueHandler] = None  # 全ロガーで共有
+        self.queue_handler_pid: Optional[int] = None  # queue_handlerを作成したプロセスのID
+        self.handlers: tuple = ()  # _setup_handlers以降は変更しない
+        self.config: Dict[str, Any] = {}
+        # get_loggerで設定済みのロガー（(name, level)ごと）
+        self._loggers: Dict[tuple, logging.Logger] = {}
+    
+    @classmethod
+    def attach_worker(
+        cls,
+        log_queue: multiprocessing.Queue,
+        config: Optional[Dict[str, Any]] = None
+    ) -> 'LoggerSingleton':
+        """
+        ワーカープロセス用にメインプロセスのQueueへ接続する
+        
+        設定ファイルの読み込み・ハンドラーの作成・Queueの作成・Listenerの起動を
+        すべて省き、Queueへ送るだけのインスタンスにする。
+        forkで起動され、マルチプロセスモードで初期化済みのインスタンスを
+        引き継いでいる場合はそのまま返す。
+        
+        Args:
+            log_queue: メインプロセスのQueue
+            config: メインプロセスで読み込んだ設定（rootのlevel・propagateのみ使用）
+                省略時はget_loggerの引数に従う
+        
+        Returns:
+            ワーカープロセス用のLoggerSingleton
+        """
+        instance = cls.__new__(cls)
+        with LoggerSingleton._lock:
+            if cls._initialized and instance.use_multiprocessing:
+                if LoggerSingleton.DEBUG:
+                    _debug(f"既に初期化済み - インスタンスID: {id(instance)}")
+                return instance
+            
+            config = config if config is not None else {}
+            listener_cpu = _listener_cpu(config)
+            instance._init_attributes(None, True, log_queue)
+            instance.config = config
+            cls._initialized = True
         
-        self._initialized = True
+        # Listenerを固定したコアは避け、残りのコアでワーカーを動かす
+        if listener_cpu is not None and hasattr(os, 'sched_getaffinity'):
+            _set_affinity(os.sched_getaffinity(0) - {listener_cpu})
+        if LoggerSingleton.DEBUG:
+            _debug(f"ワーカーとして接続 - QueueID: {id(log_queue)}")
+        return instance
     
     def _load_config(self) -> None:
-        """設定ファイルを読み込む"""
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"設定ファイルが見つかりません: {self.config_path}")
+        """
+        設定ファイルを読み込む（パース結果はプロセス内でキャッシュされる）
         
-        suffix = self.config_path.suffix.lower()
+        ワーカープロセスへはattach_workerの引数で設定を渡すこと（forkで起動された
+        ワーカーはキャッシュを引き継ぎ、spawnではYAMLのJSONサイドカーを読む）。
+        """
+        # exists()とstat()で2回問い合わせず、stat()の失敗で存在を判定する
+        try:
+            st = self.config_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"設定ファイルが見つかりません: {self.config_path}"
+            ) from None
         
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            if suffix in ['.yaml', '.yml']:
-                self.config = yaml.safe_load(f)
-            elif suffix == '.json':
-                self.config = json.load(f)
-            else:
-                raise ValueError(f"サポートされていないファイル形式: {suffix}")
+        if self._parse_cfg is None:
+            raise ValueError(f"サポートされていないファイル形式: {self.config_path.suffix}")
+        
+        self.config = _parse_config(
+            self._parse_cfg, str(self.config_path.resolve()), st.st_mtime_ns, st.st_size
+        )
     
     def _setup_handlers(self) -> None:
-        """設定ファイルに基づいてハンドラーを作成"""
+        """設定ファイルに基づいてハンドラーを作成（作成後はタプルで保持する）"""
         handlers_config = self.config.get('handlers', {})
         
+        handlers = []
         for handler_name, handler_config in handlers_config.items():
             handler = self._create_handler(handler_name, handler_config)
             if handler:
-                self.handlers.append(handler)
+                handlers.append(handler)
+        self.handlers = tuple(handlers)
     
     def _create_handler(
         self, 
@@ -120,13 +813,22 @@ class LoggerSingleton:
             filename = handler_config.get('filename', 'app.log')
             mode = handler_config.get('mode', 'a')
             encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.FileHandler(filename, mode=mode, encoding=encoding)
+            errors = handler_config.get('errors')
+            handler = WritevFileHandler(filename, mode=mode, encoding=encoding, errors=errors)
+        elif handler_type == 'async_file':
+            handler = DoubleBufferedFileHandler(
+                handler_config.get('filename', 'app.log'),
+                mode=handler_config.get('mode', 'a'),
+                encoding=handler_config.get('encoding', 'utf-8'),
+                buffer_size=handler_config.get('buffer_size', 1 << 20),
+                flush_interval=handler_config.get('flush_interval', 1.0)
+            )
         elif handler_type == 'rotating_file':
             filename = handler_config.get('filename', 'app.log')
             max_bytes = handler_config.get('max_bytes', 10485760)
             backup_count = handler_config.get('backup_count', 5)
             encoding = handler_config.get('encoding', 'utf-8')
-            handler = logging.handlers.RotatingFileHandler(
+            handler = CountingRotatingFileHandler(
                 filename, 
                 maxBytes=max_bytes, 
                 backupCount=backup_count,
@@ -134,67 +836,121 @@ class LoggerSingleton:
             )
         
         if handler:
-            handler.setLevel(getattr(logging, level.upper()))
+            handler.setLevel(_to_level(level))
             format_string = formatter_config.get(
                 'format', 
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             date_format = formatter_config.get('datefmt', '%Y-%m-%d %H:%M:%S')
-            formatter = logging.Formatter(format_string, datefmt=date_format)
+            formatter = _get_formatter(format_string, date_format)
             handler.setFormatter(formatter)
         
         return handler
     
-    def _setup_multiprocessing(self, queue_size: int) -> None:
-        """マルチプロセス用のQueueとListenerを設定"""
-        if queue_size == -1:
-            self.log_queue = multiprocessing.Queue()
-        else:
-            self.log_queue = multiprocessing.Queue(maxsize=queue_size)
+    def _setup_multiprocessing(self, queue_size: int, listener_cpu: Optional[int] = None) -> None:
+        """
+        マルチプロセス用のQueueとListenerを設定
+        
+        QueueとQueueListenerはメインプロセスでのみ作成する。ワーカープロセスでは
+        （spawnで起動されシングルトンが作り直されても）渡されたQueueを使うだけで、
+        Listenerのスレッドは起動しない。
+        """
+        if not _is_main_process():
+            if self.log_queue is None:
+                raise ValueError("ワーカープロセスではメインプロセスのlog_queueを指定してください")
+            if LoggerSingleton.DEBUG:
+                _debug(f"メインプロセスのQueueを使用 - QueueID: {id(self.log_queue)}")
+            return
         
-        print(f"[PID={multiprocessing.current_process().pid}] Queue作成 - QueueID: {id(self.log_queue)}")
+        if self.log_queue is None:
+            if queue_size == -1:
+                # 送信スレッドを持たず、putで直接パイプへ書き込むSimpleQueueを使用
+                self.log_queue = multiprocessing.SimpleQueue()
+            else:
+                self.log_queue = multiprocessing.Queue(maxsize=queue_size)
+            if LoggerSingleton.DEBUG:
+                _debug(f"Queue作成 - QueueID: {id(self.log_queue)}")
         
-        self.listener = logging.handlers.QueueListener(
+        self.listener = BatchQueueListener(
             self.log_queue,
             *self.handlers,
-            respect_handler_level=True
+            respect_handler_level=True,
+            cpu=listener_cpu
         )
         self.listener.start()
-        print(f"[PID={multiprocessing.current_process().pid}] QueueListener起動")
+        self.owner_pid = _PID
+        if LoggerSingleton.DEBUG:
+            _debug("QueueListener起動")
     
-    def get_logger(self, name: str = None, level: str = 'INFO') -> logging.Logger:
+    def get_logger(self, name: str = None, level: Union[str, int] = 'INFO') -> logging.Logger:
         """
         ロガーを取得
         
         Args:
             name: ロガーの名前（Noneの場合はrootロガー）
-            level: ログレベル
+            level: ログレベル（名前またはlogging.INFO等の数値）
         
         Returns:
             設定されたロガーオブジェクト
         """
+        # forkで複製されたインスタンスのロガーは親プロセスのQueueHandlerを持つため使わない
+        if self.use_multiprocessing and self.queue_handler_pid != _PID:
+            self._loggers.clear()
+        
+        # 設定済みであればハンドラーを付け直さずに返す
+        cached = self._loggers.get((name, level))
+        if cached is not None:
+            return cached
+        
         logger = logging.getLogger(name)
-        log_level = self.config.get('root', {}).get('level', level.upper())
-        logger.setLevel(getattr(logging, log_level))
-        logger.handlers.clear()
+        log_level = _to_level(self.config.get('root', {}).get('level', level))
+        logger.setLevel(log_level)
         
+        # ハンドラーは1回の代入で置き換える（clear()とaddHandlerの繰り返しを避ける。
+        # self.handlersはタプルなので、ロガーにはリストにして渡す）
         if self.use_multiprocessing:
             if self.log_queue is None:
                 raise RuntimeError("log_queueが初期化されていません")
-            print(f"[PID={multiprocessing.current_process().pid}] get_logger: QueueID={id(self.log_queue)}")
-            queue_handler = logging.handlers.QueueHandler(self.log_queue)
-            logger.addHandler(queue_handler)
+            if LoggerSingleton.DEBUG:
+                _debug(f"get_logger: QueueID={id(self.log_queue)}")
+            logger.handlers = [self._get_queue_handler()]
         else:
-            for handler in self.handlers:
-                logger.addHandler(handler)
+            logger.handlers = list(self.handlers)
         
         logger.propagate = self.config.get('root', {}).get('propagate', False)
+        self._loggers[(name, level)] = logger
         return logger
     
+    def _get_queue_handler(self) -> BatchingQueueHandler:
+        """
+        全ロガーで共有するBatchingQueueHandlerを取得（プロセスごとに1回だけ作成）
+        
+        forkで複製されたインスタンスのハンドラーはフラッシュ用のスレッドを
+        持たないため、プロセスIDが変わっていれば作り直す。
+        """
+        if self.queue_handler is None or self.queue_handler_pid != _PID:
+            self.queue_handler = BatchingQueueHandler(self.log_queue)
+            self.queue_handler_pid = _PID
+            # プロセス終了時に残りのレコードを送る（forkで起動されたワーカーではatexitが
+            # 実行されないため、multiprocessingの終了処理に登録する。multiprocessing.Queueの
+            # 送信スレッドを止める終了処理（優先度10）より前に実行されるよう優先度を高くしておく）
+            multiprocessing.util.Finalize(None, self.queue_handler.close, exitpriority=20)
+        return self.queue_handler
+    
     def stop(self) -> None:
-        """QueueListenerを停止"""
-        if self.listener:
-            print(f"[PID={multiprocessing.current_process().pid}] QueueListener停止")
+        """
+        QueueListenerを停止
+        
+        forkで複製されたワーカープロセスのインスタンスからは停止しない
+        （停止用のセンチネルがメインプロセスのListenerに届いてしまうため）。
+        """
+        if self.listener and self.owner_pid == _PID:
+            if LoggerSingleton.DEBUG:
+                _debug("QueueListener停止")
+            # このプロセスでバッファに残っているレコードを先に送り、以降のレコードは
+            # 破棄させる（Listenerの停止後も送り続けるとQueueが埋まってputが戻らなくなる）
+            if self.queue_handler is not None and self.queue_handler_pid == _PID:
+                self.queue_handler.close()
             self.listener.stop()
             self.listener = None
     
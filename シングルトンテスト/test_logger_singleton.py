@@ -0,0 +1,381 @@
+"""
+logger_singleton.pyの部品（ハンドラー・Listener）の単体テスト
+
+test_singleton.py（マルチプロセスでの検証用）とは別に、unittestで実行します。
+"""
+
+import json
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import logger_singleton
+
+
+def _make_record(level: int, msg: str) -> logging.LogRecord:
+    """テスト用のLogRecordを作成"""
+    return logging.LogRecord('test_singleton', level, __file__, 0, msg, None, None)
+
+
+class TestYamlSidecar(unittest.TestCase):
+    """YAMLの設定ファイルのJSONサイドカーのテスト"""
+    
+    def setUp(self):
+        """テストの前処理"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / 'config.yaml'
+        self.path.write_text('root:\n  level: INFO\n', encoding='utf-8')
+    
+    def tearDown(self):
+        """テストの後処理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _load(self) -> dict:
+        """設定ファイルの現在の更新時刻・サイズで読み込む"""
+        st = self.path.stat()
+        return logger_singleton._load_yaml_with_sidecar(self.path, st.st_mtime_ns, st.st_size)
+    
+    def test_sidecar_used_when_source_matches(self):
+        """変換元の更新時刻・サイズが一致する場合にサイドカーが使われるかのテスト"""
+        self.assertEqual(self._load(), {'root': {'level': 'INFO'}})
+        
+        cache_path = self.temp_dir / 'config.yaml.jsoncache'
+        cached = json.loads(cache_path.read_text(encoding='utf-8'))
+        cached['config'] = {'from': 'sidecar'}
+        cache_path.write_text(json.dumps(cached), encoding='utf-8')
+        self.assertEqual(self._load(), {'from': 'sidecar'})
+    
+    def test_sidecar_ignored_for_restored_older_file(self):
+        """古い更新時刻の設定ファイルに戻された場合にサイドカーが使われないかのテスト"""
+        old_mtime_ns = self.path.stat().st_mtime_ns - 10_000_000_000
+        self._load()
+        
+        self.path.write_text('root:\n  level: DEBUG\n', encoding='utf-8')
+        os.utime(self.path, ns=(old_mtime_ns, old_mtime_ns))
+        self.assertEqual(self._load(), {'root': {'level': 'DEBUG'}})
+
+
+class TestBatchingQueueHandler(unittest.TestCase):
+    """BatchingQueueHandlerのテスト"""
+    
+    def setUp(self):
+        """テストの前処理（定期フラッシュが割り込まないよう間隔を長くする）"""
+        self.queue = queue.Queue()
+        self.handler = logger_singleton.BatchingQueueHandler(
+            self.queue, capacity=3, flush_interval=60
+        )
+    
+    def tearDown(self):
+        """テストの後処理"""
+        self.handler.close()
+    
+    def test_sends_batch_at_capacity(self):
+        """capacity件たまった時に1回のputでまとめて送るかのテスト"""
+        self.handler.handle(_make_record(logging.INFO, 'first'))
+        self.handler.handle(_make_record(logging.INFO, 'second'))
+        self.assertTrue(self.queue.empty())
+        
+        self.handler.handle(_make_record(logging.INFO, 'third'))
+        batch = self.queue.get_nowait()
+        self.assertEqual([record.msg for record in batch], ['first', 'second', 'third'])
+        self.assertTrue(self.queue.empty())
+    
+    def test_sends_batch_at_flush_level(self):
+        """flush_level以上のレコードが来た時にたまっていたレコードと一緒に送るかのテスト"""
+        self.handler.handle(_make_record(logging.INFO, 'info'))
+        self.handler.handle(_make_record(logging.ERROR, 'error'))
+        
+        batch = self.queue.get_nowait()
+        self.assertEqual([record.msg for record in batch], ['info', 'error'])
+    
+    def test_flush_sends_partial_batch(self):
+        """flush()でcapacityに満たないバッファも送るかのテスト"""
+        self.handler.handle(_make_record(logging.INFO, 'pending'))
+        self.handler.flush()
+        
+        self.assertEqual([record.msg for record in self.queue.get_nowait()], ['pending'])
+        self.handler.flush()
+        self.assertTrue(self.queue.empty())
+    
+    def test_drops_records_after_close(self):
+        """close()で残りを送り、以降のレコードは破棄するかのテスト"""
+        self.handler.handle(_make_record(logging.INFO, 'before'))
+        self.handler.close()
+        self.handler.handle(_make_record(logging.ERROR, 'after'))
+        self.handler.flush()
+        
+        self.assertEqual([record.msg for record in self.queue.get_nowait()], ['before'])
+        self.assertTrue(self.queue.empty())
+    
+    def test_listener_expands_batches(self):
+        """BatchQueueListenerが送られたリストを展開してハンドラーへ渡すかのテスト"""
+        received = []
+        target = logging.Handler()
+        target.emit = received.append
+        listener = logger_singleton.BatchQueueListener(self.queue, target)
+        listener.start()
+        try:
+            for msg in ('a', 'b', 'c', 'd'):
+                self.handler.handle(_make_record(logging.INFO, msg))
+            self.handler.flush()
+        finally:
+            listener.stop()
+        
+        self.assertEqual([record.msg for record in received], ['a', 'b', 'c', 'd'])
+
+
+class TestWritevFileHandler(unittest.TestCase):
+    """WritevFileHandlerのテスト"""
+    
+    def setUp(self):
+        """テストの前処理"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.log_path = self.temp_dir / 'writev.log'
+    
+    def tearDown(self):
+        """テストの後処理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _make_handler(self, **kwargs) -> logger_singleton.WritevFileHandler:
+        """メッセージだけを出力するハンドラーを作成"""
+        handler = logger_singleton.WritevFileHandler(str(self.log_path), **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.addCleanup(handler.close)
+        return handler
+    
+    def test_handle_batch_writes_in_order(self):
+        """1件ずつのemitとhandle_batchの出力が順番どおりに書き込まれるかのテスト"""
+        handler = self._make_handler(encoding='utf-8')
+        handler.handle(_make_record(logging.INFO, 'single'))
+        handler.handle_batch([_make_record(logging.INFO, f'batch {i}') for i in range(3)])
+        
+        self.assertEqual(
+            self.log_path.read_text(encoding='utf-8'), 'single\nbatch 0\nbatch 1\nbatch 2\n'
+        )
+    
+    def test_handle_batch_applies_filters(self):
+        """フィルターで除外されたレコードを書き込まないかのテスト"""
+        handler = self._make_handler(encoding='utf-8')
+        handler.addFilter(lambda record: record.msg != 'skip')
+        handler.handle_batch([_make_record(logging.INFO, msg) for msg in ('keep', 'skip', 'also')])
+        
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), 'keep\nalso\n')
+    
+    def test_handle_batch_uses_errors(self):
+        """エンコードできない文字をerrorsに従って置き換えるかのテスト"""
+        handler = self._make_handler(encoding='ascii', errors='replace')
+        handler.handle_batch([_make_record(logging.INFO, 'caf\u00e9')])
+        
+        self.assertEqual(self.log_path.read_text(encoding='ascii'), 'caf?\n')
+    
+    def test_handle_batch_falls_back_to_emit(self):
+        """エンコードに失敗した場合に1件ずつ書き込み、失敗したレコードだけを報告するかのテスト"""
+        handler = self._make_handler(encoding='ascii')
+        failed = []
+        handler.handleError = failed.append
+        handler.handle_batch([_make_record(logging.INFO, msg) for msg in ('ok', 'caf\u00e9', 'next')])
+        
+        self.assertEqual(self.log_path.read_text(encoding='ascii'), 'ok\nnext\n')
+        self.assertEqual([record.msg for record in failed], ['caf\u00e9'])
+
+
+class TestCountingRotatingFileHandler(unittest.TestCase):
+    """CountingRotatingFileHandlerのテスト"""
+    
+    def setUp(self):
+        """テストの前処理"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.log_path = self.temp_dir / 'rotating.log'
+    
+    def tearDown(self):
+        """テストの後処理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _make_handler(self, max_bytes: int, backup_count: int = 2) -> logger_singleton.CountingRotatingFileHandler:
+        """メッセージだけを出力するハンドラーを作成"""
+        handler = logger_singleton.CountingRotatingFileHandler(
+            str(self.log_path), maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.addCleanup(handler.close)
+        return handler
+    
+    def _read(self, suffix: str = '') -> str:
+        """ログファイル（suffixでバックアップを指定）を読み込む"""
+        return Path(f'{self.log_path}{suffix}').read_text(encoding='utf-8')
+    
+    def test_rotates_by_written_bytes(self):
+        """書き込んだバイト数の合計でローテーションし、ローテーション後に数え直すかのテスト"""
+        handler = self._make_handler(max_bytes=25)
+        for i in range(5):
+            handler.handle(_make_record(logging.INFO, f'message {i}'))
+        
+        self.assertEqual(self._read(), 'message 4\n')
+        self.assertEqual(self._read('.1'), 'message 2\nmessage 3\n')
+        self.assertEqual(self._read('.2'), 'message 0\nmessage 1\n')
+        self.assertEqual(handler._size, len('message 4\n'))
+    
+    def test_counts_existing_file_size(self):
+        """開いた時点のファイルサイズを数えに含めるかのテスト"""
+        self.log_path.write_text('x' * 15 + '\n', encoding='utf-8')
+        handler = self._make_handler(max_bytes=20)
+        handler.handle(_make_record(logging.INFO, 'new line'))
+        
+        self.assertEqual(self._read(), 'new line\n')
+        self.assertEqual(self._read('.1'), 'x' * 15 + '\n')
+    
+    def test_counts_encoded_bytes(self):
+        """文字数ではなくエンコード後のバイト数で判定するかのテスト"""
+        handler = self._make_handler(max_bytes=7)
+        handler.handle(_make_record(logging.INFO, '\u00e9\u00e9'))
+        handler.handle(_make_record(logging.INFO, '\u00e9\u00e9'))
+        
+        self.assertEqual(self._read(), '\u00e9\u00e9\n')
+        self.assertEqual(self._read('.1'), '\u00e9\u00e9\n')
+    
+    def test_non_regular_file_not_rotated(self):
+        """通常ファイル以外（/dev/null）はローテーションしないかのテスト"""
+        if not os.path.exists(os.devnull):
+            self.skipTest('os.devnull does not exist')
+        handler = logger_singleton.CountingRotatingFileHandler(os.devnull, maxBytes=1, encoding='utf-8')
+        self.addCleanup(handler.close)
+        
+        self.assertFalse(handler.shouldRollover(_make_record(logging.INFO, 'message')))
+
+
+class TestDoubleBufferedFileHandler(unittest.TestCase):
+    """DoubleBufferedFileHandlerのテスト"""
+    
+    def setUp(self):
+        """テストの前処理"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.log_path = self.temp_dir / 'async.log'
+    
+    def tearDown(self):
+        """テストの後処理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _make_handler(self, **kwargs) -> logger_singleton.DoubleBufferedFileHandler:
+        """メッセージだけを出力するハンドラーを作成"""
+        handler = logger_singleton.DoubleBufferedFileHandler(str(self.log_path), **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.addCleanup(handler.close)
+        return handler
+    
+    def _wait_for(self, expected: str, timeout: float = 5.0) -> str:
+        """ログファイルが期待した内容になるまで待つ（書き込み用のスレッドが書き込むため）"""
+        deadline = time.monotonic() + timeout
+        content = ''
+        while time.monotonic() < deadline:
+            content = self.log_path.read_text(encoding='utf-8')
+            if content == expected:
+                break
+            time.sleep(0.01)
+        return content
+    
+    def test_flush_writes_buffer(self):
+        """バッファのレコードがflush()まで書き込まれず、flush()で書き込まれるかのテスト"""
+        handler = self._make_handler(flush_interval=60)
+        handler.handle(_make_record(logging.INFO, 'first'))
+        handler.handle(_make_record(logging.INFO, 'second'))
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), '')
+        
+        handler.flush()
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), 'first\nsecond\n')
+    
+    def test_hands_off_at_watermark(self):
+        """バッファがbuffer_sizeの75%を超えると書き込み用のスレッドへ渡されるかのテスト"""
+        handler = self._make_handler(buffer_size=40, flush_interval=60)
+        for i in range(3):
+            handler.handle(_make_record(logging.INFO, f'message {i}'))
+        
+        expected = 'message 0\nmessage 1\nmessage 2\n'
+        self.assertEqual(self._wait_for(expected), expected)
+    
+    def test_periodic_flush(self):
+        """flush_interval秒ごとに閾値に達していないバッファも書き込まれるかのテスト"""
+        handler = self._make_handler(flush_interval=0.05)
+        handler.handle(_make_record(logging.INFO, 'periodic'))
+        
+        self.assertEqual(self._wait_for('periodic\n'), 'periodic\n')
+    
+    def test_close_writes_remaining(self):
+        """close()で残りのバッファを書き込むかのテスト"""
+        handler = self._make_handler(flush_interval=60)
+        handler.handle(_make_record(logging.INFO, 'remaining'))
+        handler.close()
+        
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), 'remaining\n')
+    
+    def test_flush_after_writer_died(self):
+        """書き込み用のスレッドが異常終了してもflush()が戻り、呼び出し元で書き込むかのテスト"""
+        write_all = logger_singleton._write_all
+        failures = [RuntimeError('writer died')]
+        
+        def fail_once(fd, lines):
+            if failures:
+                raise failures.pop()
+            write_all(fd, lines)
+        
+        with mock.patch.object(logger_singleton, '_write_all', fail_once), \
+                mock.patch.object(threading, 'excepthook', lambda args: None):
+            handler = self._make_handler(flush_interval=0.05)
+            handler.handle(_make_record(logging.INFO, 'first'))
+            handler.flush()
+            handler._writer.join(5)
+            self.assertFalse(handler._writer.is_alive())
+            
+            handler.handle(_make_record(logging.INFO, 'second'))
+            handler.flush()
+            handler.close()
+        
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), 'first\nsecond\n')
+    
+    def test_config_options(self):
+        """設定ファイルのbuffer_size・flush_intervalがハンドラーに渡されるかのテスト"""
+        config_path = self.temp_dir / 'config.json'
+        config_path.write_text(
+            '{"handlers": {"async": {"type": "async_file", "filename": "%s", '
+            '"buffer_size": 4096, "flush_interval": 0.25}}}' % self.log_path.as_posix(),
+            encoding='utf-8'
+        )
+        self.addCleanup(logger_singleton.LoggerSingleton.reset)
+        manager = logger_singleton.LoggerSingleton(config_path)
+        handler = manager.handlers[0]
+        self.addCleanup(handler.close)
+        
+        self.assertIsInstance(handler, logger_singleton.DoubleBufferedFileHandler)
+        self.assertEqual(handler._watermark, 4096 * 3 // 4)
+        self.assertEqual(handler._flush_interval, 0.25)
+
+
+class TestListenerCpu(unittest.TestCase):
+    """listener_cpuの検証のテスト"""
+    
+    def test_valid_values(self):
+        """整数・整数の文字列をコア番号に変換するかのテスト"""
+        self.assertIsNone(logger_singleton._listener_cpu({}))
+        self.assertEqual(logger_singleton._listener_cpu({'listener_cpu': 0}), 0)
+        self.assertEqual(logger_singleton._listener_cpu({'listener_cpu': '2'}), 2)
+    
+    def test_invalid_values(self):
+        """負の値・整数に変換できない値でValueErrorになるかのテスト"""
+        for value in (-1, 'abc', True, [0]):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    logger_singleton._listener_cpu({'listener_cpu': value})
+    
+    def test_set_affinity_ignores_unusable_cpus(self):
+        """設定できないコアを指定しても例外にならないかのテスト"""
+        logger_singleton._set_affinity({1 << 20})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,41 +1,59 @@
 """
 シングルトンLoggerのテストコード
 
-マルチプロセスでシングルトンのQueueが共有されるかを検証します。
+マルチプロセスで全プロセスのログがメインプロセスの1つのQueueへ集約されるかを検証します。
 
-予想結果：
-- メインプロセスと各ワーカープロセスで異なるインスタンスが作成される
-- 各プロセスで異なるQueueが作成される
-- したがって、ログが正しく集約されない可能性が高い
+ログの集約方法：
+- メインプロセスがQueueと1つのBatchQueueListenerを作成する
+- ワーカープロセスはProcessPoolExecutorのinitargsでメインプロセスのQueueと設定を受け取り、
+  _init_workerからLoggerSingleton.attach_workerを呼んで接続する
+  （設定ファイルの読み込み・Listenerの起動は行わない）
+- 全プロセスのログがlogs/singleton_test.logに書き込まれる
 """
 
+import logging
 import time
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from logger_singleton import LoggerSingleton
 
 
+def _init_worker(log_queue, config):
+    """
+    ワーカープロセスの初期化（プロセスプールの各プロセスで1回だけ実行）
+    
+    シングルトンでもプロセス間ではQueueが共有されないため、
+    メインプロセスのQueueを引数で受け取って接続する
+    （設定ファイルの読み込み・Listenerの起動は行わない）
+    """
+    # spawnで起動されたワーカーはモジュールを読み込み直すため、ここで経過の表示を有効にする
+    LoggerSingleton.DEBUG = True
+    LoggerSingleton.attach_worker(log_queue, config)
+
+
 def worker_process(process_id: int):
     """
-    ワーカープロセス
+    ワーカープロセスで実行するタスク
     
-    シングルトンなので、引数でQueueを渡さずに
-    直接LoggerSingletonのインスタンスを取得
+    _init_workerで接続済みのシングルトンを使用する（タスクごとの初期化はない）
     """
     print(f"\n=== Worker {process_id} 開始 ===")
     
-    # シングルトンインスタンスを取得（理論上、メインと同じインスタンスのはず...）
-    logger_manager = LoggerSingleton('logging_config.yaml', use_multiprocessing=True)
+    logger_manager = LoggerSingleton()
     logger = logger_manager.get_logger(f'worker_{process_id}')
     
-    # ログ出力
-    logger.info(f'ワーカー {process_id} が開始しました')
+    # ログ出力（f-stringではなく引数で渡し、レベルで除外された場合は整形しない）
+    logger.info('ワーカー %d が開始しました', process_id)
     
+    # ループ内はレベル判定を1回にまとめる
+    info_enabled = logger.isEnabledFor(logging.INFO)
     for i in range(3):
-        logger.info(f'ワーカー {process_id} - 処理 {i+1}/3')
+        if info_enabled:
+            logger.info('ワーカー %d - 処理 %d/3', process_id, i + 1)
         time.sleep(0.1)
     
-    logger.info(f'ワーカー {process_id} が完了しました')
+    logger.info('ワーカー %d が完了しました', process_id)
     print(f"=== Worker {process_id} 終了 ===\n")
 
 
@@ -45,6 +63,9 @@ def test_singleton_multiprocessing():
     print("シングルトンパターン マルチプロセステスト")
     print("=" * 60)
     
+    # 初期化・Queue作成の経過を表示する
+    LoggerSingleton.DEBUG = True
+    
     # logsディレクトリを作成
     Path('logs').mkdir(exist_ok=True)
     
@@ -54,22 +75,20 @@ def test_singleton_multiprocessing():
     main_logger = main_logger_manager.get_logger('main_process')
     
     main_logger.info('メインプロセス: テストを開始します')
-    main_logger.info(f'メインプロセスのインスタンスID: {id(main_logger_manager)}')
-    main_logger.info(f'メインプロセスのQueueID: {id(main_logger_manager.log_queue)}')
+    main_logger.info('メインプロセスのインスタンスID: %d', id(main_logger_manager))
+    main_logger.info('メインプロセスのQueueID: %d', id(main_logger_manager.log_queue))
     
-    print("\n--- ワーカープロセスを起動（Queueを渡さない） ---")
+    print("\n--- ワーカープロセスを起動（メインプロセスのQueueを渡す） ---")
     num_processes = 3
-    processes = []
     
-    # ワーカープロセスを起動（引数でQueueを渡さない）
-    for i in range(num_processes):
-        p = multiprocessing.Process(target=worker_process, args=(i,))
-        p.start()
-        processes.append(p)
-    
-    # プロセスの完了を待つ
-    for p in processes:
-        p.join()
+    # プロセスプールでタスクを実行（QueueListenerはメインプロセスの1つだけ。
+    # 各ワーカープロセスは起動時に1回だけQueueへ接続し、以降のタスクで使い回す）
+    with ProcessPoolExecutor(
+        max_workers=num_processes,
+        initializer=_init_worker,
+        initargs=(main_logger_manager.log_queue, main_logger_manager.config)
+    ) as executor:
+        list(executor.map(worker_process, range(num_processes)))
     
     print("\n--- すべてのワーカープロセスが完了 ---")
     main_logger.info('メインプロセス: すべてのワーカーが完了しました')
@@ -83,12 +102,12 @@ def test_singleton_multiprocessing():
     print("=" * 60)
     
     print("\n【検証結果】")
-    print("上記の出力で、各ワーカープロセスの「新規初期化」と「QueueID」を確認してください。")
-    print("メインプロセスと異なるIDが表示されていれば、")
-    print("シングルトンでもプロセス間ではインスタンスが共有されないことが証明されます。")
-    print("\nログファイル（logs/singleton_test.log）も確認してください。")
-    print("ワーカープロセスのログが記録されていない、または")
-    print("各プロセスが独自のログファイルを持っている可能性があります。")
+    print("上記の出力で、「Queue作成」「QueueListener起動」がメインプロセスの1回だけであることを確認してください。")
+    print("spawnで起動されたワーカープロセスには「ワーカーとして接続 - QueueID: ...」が表示されます")
+    print("（forkの場合はメインプロセスのインスタンスを引き継ぐため「既に初期化済み」と表示されます）。")
+    print("QueueIDはプロセスごとのオブジェクトのIDのため値は異なりますが、同じQueueに接続しています。")
+    print("\nログファイル（logs/singleton_test.log）に、メインプロセスと")
+    print("すべてのワーカープロセスのログが記録されていることを確認してください。")
 
 
 def test_singleton_basic():
@@ -97,6 +116,9 @@ def test_singleton_basic():
     print("シングルトンパターン 基本テスト（単一プロセス）")
     print("=" * 60)
     
+    # 初期化の経過を表示する
+    LoggerSingleton.DEBUG = True
+    
     # logsディレクトリを作成
     Path('logs').mkdir(exist_ok=True)
     